@@ -1,4 +1,6 @@
 import tkinter as tk
+from curve import plot_adaptive
+import roots
 
 def create_window_with_canvas(width: int, height: int):
     '''
@@ -74,21 +76,12 @@ def f(x):
 def g(x):
     return 0.5 * (x + 2 / x)
 
-def draw_graph(canvas, width, height, func, scale, step=0.1):
+def draw_graph(canvas, width, height, func, scale, tolerance=0.5):
     '''
-    Рисует график функции.
+    Рисует график функции (точки сгущаются на изгибах, см. curve.plot_adaptive).
     '''
     graph_color = "#00ff00"  # ярко-зелёный
-    x = -10.0
-    while x <= 10.0:
-        x1, y1 = x, func(x)
-        x2, y2 = x + step, func(x + step)
-        canvas.create_line(
-            width // 2 + x1 * scale, height // 2 - y1 * scale,
-            width // 2 + x2 * scale, height // 2 - y2 * scale,
-            fill=graph_color, width=2
-        )
-        x += step
+    plot_adaptive(canvas, func, -10.0, 10.0, scale, width // 2, height // 2, tolerance, fill=graph_color, width=2)
 
 def draw_iteration(canvas, width, height, x0, x1, scale):
     '''
@@ -128,17 +121,27 @@ def plot_root(canvas, width, height, root_x, scale):
         fill=root_color
     )
 
-def simple_iteration_method(canvas, width, height, x0, scale, tol=1e-4, max_iter=20):
+def simple_iteration_method(canvas, width, height, x0, scale, tol=1e-4, max_iter=20, mode='plain', depth=3,
+                            trace=None):
     '''
     Метод простой итерации для уравнения f(x) = 0.
+
+    mode — способ ускорения: 'plain' (без ускорения), 'aitken',
+    'steffensen' или 'anderson' (depth — глубина истории Андерсона).
+    Для ускоренных способов выводится, сколько итераций сэкономлено
+    по сравнению с простой итерацией.
+    trace — журнал работы метода (solver_trace.Trace), необязательный.
     '''
-    for _ in range(max_iter):
-        x1 = g(x0)
-        draw_iteration(canvas, width, height, x0, x1, scale)
-        if abs(x1 - x0) < tol:
-            break
-        x0 = x1
-    plot_root(canvas, width, height, x0, scale)
+    root_x, iterations, evaluations = roots.fixed_point(
+        g, x0, tol, max_iter, mode, depth,
+        on_step=lambda x0, x1: draw_iteration(canvas, width, height, x0, x1, scale),
+        trace=trace
+    )
+    if mode != 'plain':
+        _, plain_iterations, _ = roots.fixed_point(g, x0, tol, max_iter)
+        print(f"{mode}: {iterations} итераций ({evaluations} вычислений g), "
+              f"простая итерация: {plain_iterations}, сэкономлено: {plain_iterations - iterations}")
+    plot_root(canvas, width, height, root_x, scale)
 
 if __name__ == "__main__":
     width, height = 700, 700
@@ -0,0 +1,161 @@
+import math
+import threading
+
+import numpy as np
+from numpy.polynomial import legendre
+
+from quadrature import evaluate, gauss_legendre_nodes
+from solver_trace import NO_TRACE
+
+
+class Antiderivative:
+    """
+    Таблица первообразной функции для быстрых запросов integral(a, b).
+
+    Ось делится на равные панели шага step, выровненные по нулю. На каждой
+    панели функция вычисляется в order узлах Гаусса–Лежандра и заменяется
+    интерполяционным многочленом (в базисе Лежандра), который
+    интегрируется точно. В таблице хранятся значение первообразной на левом
+    краю каждой панели и коэффициенты многочлена внутри неё, поэтому
+    integral(a, b) — это два обращения к таблице: номер панели находится
+    делением, а не поиском.
+
+    Точность контролируется по старшим коэффициентам Лежандра: если на
+    какой-то панели оценка погрешности больше tol·step, шаг уменьшается
+    вдвое и таблица строится заново (но не мельче max_panels панелей).
+    Таблица строится лениво — при первом запросе — и расширяется (с запасом,
+    вдвое), когда запрос выходит за построенный отрезок. При смене функции
+    нужно создать новую таблицу.
+
+    Функция должна быть конечной на построенном отрезке; для полюсов
+    см. singular.integrate.
+    """
+
+    def __init__(self, function, tol=1e-10, order=10, step=0.25, max_panels=1 << 16):
+        self.function = function
+        self.tol = tol
+        self.order = order
+        self.step = step
+        self.max_panels = max_panels
+        self.evaluations = 0
+        self.converged = True       # достигнута ли точность tol на всех панелях
+        self._nodes = gauss_legendre_nodes(order)[0]
+        # значения в узлах -> коэффициенты интерполяционного многочлена
+        self._fit = np.linalg.inv(legendre.legvander(self._nodes, order - 1)).T
+        self._lock = threading.Lock()
+        self._clear()
+
+    def _clear(self):
+        self._first = 0                                  # номер первой панели
+        self._base = np.zeros(0)                         # первообразная на левых краях панелей
+        self._coef = np.zeros((0, self.order + 1))       # многочлены первообразной на панелях
+
+    def covered(self):
+        """
+        Возвращает отрезок, на котором таблица уже построена (или None).
+        """
+        if not self._base.size:
+            return None
+        return self._first * self.step, (self._first + self._base.size) * self.step
+
+    def integral(self, a, b, trace=None):
+        """
+        Интеграл от a до b (числа или массивы одной формы).
+        Погрешность — около tol·|b - a|.
+        trace — журнал (solver_trace.Trace): в нём учитываются вычисления
+        функции, которые понадобились для построения или расширения таблицы.
+        """
+        log = trace or NO_TRACE
+        log.start('antiderivative')
+        a = np.asarray(a, dtype=float)
+        b = np.asarray(b, dtype=float)
+        with self._lock:
+            before = self.evaluations
+            self._ensure(min(a.min(), b.min()), max(a.max(), b.max()))
+            value = self._primitive(b) - self._primitive(a)
+            if trace is not None:
+                trace.evaluations += self.evaluations - before
+        value = float(value) if value.ndim == 0 else value
+        log.record(value)
+        log.finish('converged' if self.converged else 'max_panels')
+        return value
+
+    def _primitive(self, x):
+        """
+        Первообразная в точках x (отсчитывается от левого края таблицы).
+        """
+        h = self.step
+        k = np.clip(np.floor(x / h).astype(int) - self._first, 0, self._base.size - 1)
+        t = 2 * (x - (self._first + k) * h) / h - 1
+        return self._base[k] + legendre.legval(t, self._coef[k].T, tensor=False)
+
+    def _ensure(self, start, finish):
+        """
+        Строит таблицу так, чтобы она покрывала [start, finish].
+        """
+        while True:
+            h = self.step
+            lo = math.floor(start / h)
+            hi = max(math.floor(finish / h) + 1, lo + 1)
+            count = self._base.size
+            first, last = self._first, self._first + count
+            if count and first <= lo and hi <= last:
+                return
+            if count:
+                requested = min(first, lo), max(last, hi)
+                # расширяем с запасом, чтобы серия запросов не перестраивала таблицу каждый раз
+                grown = (min(first, lo if lo >= first else min(lo, first - count)),
+                         max(last, hi if hi <= last else max(hi, last + count)))
+            else:
+                first = last = lo
+                requested = grown = lo, hi
+
+            # запас может зайти туда, где функция не определена или имеет полюс
+            # (log(x) левее нуля, tan за pi/2); тогда строим только запрошенное
+            for lo, hi in dict.fromkeys((grown, requested)):
+                try:
+                    left = self._panels(lo, first - lo)
+                    right = self._panels(last, hi - last)
+                except ValueError:
+                    if (lo, hi) == requested:
+                        raise
+                    continue
+                error = np.concatenate((left[1], right[1]))
+                if (lo, hi) == requested or not (error.size and error.max() > self.tol * h):
+                    break
+            if error.size and error.max() > self.tol * h:
+                if 2 * (hi - lo) <= self.max_panels:
+                    # шаг мелковат: строим заново вдвое мельче запрошенный отрезок
+                    # и уже построенную часть (но не запас и не хвост последней панели)
+                    if count:
+                        start, finish = min(start, first * h), max(finish, last * h)
+                    self.step = h / 2
+                    self._clear()
+                    continue
+                self.converged = False
+
+            coef = np.concatenate((left[0], self._coef, right[0]))
+            totals = coef.sum(axis=1)      # многочлены Лежандра в t = 1 равны 1
+            self._base = np.concatenate(([0.0], np.cumsum(totals[:-1])))
+            self._coef = coef
+            self._first = lo
+            return
+
+    def _panels(self, first, count):
+        """
+        Многочлены первообразной и оценки погрешности для count панелей,
+        начиная с панели first.
+        """
+        if count <= 0:
+            return np.zeros((0, self.order + 1)), np.zeros(0)
+        h = self.step
+        left = (first + np.arange(count)) * h
+        x = left[:, None] + (self._nodes + 1) * (h / 2)
+        y = evaluate(self.function, x)
+        self.evaluations += y.size
+        if not np.all(np.isfinite(y)):
+            bad = x[~np.isfinite(y)][0]
+            raise ValueError(f"функция не конечна при x = {bad}")
+        c = y @ self._fit
+        error = h * (np.abs(c[:, -1]) + np.abs(c[:, -2]))
+        return legendre.legint(c, lbnd=-1, axis=1) * (h / 2), error
@@ -0,0 +1,168 @@
+import numpy as np
+
+
+class Dual:
+    """
+    Дуальное число value + derivative·ε, где ε² = 0.
+
+    Если вычислить функцию от Dual(x, 1), то получится
+    Dual(f(x), f'(x)): производная считается автоматически за одно
+    вычисление функции (прямой режим автоматического дифференцирования).
+    Работают арифметические операции и функции NumPy np.sin, np.cos,
+    np.tan, np.exp, np.log, np.sqrt, np.arctan и т. п.; value и
+    derivative могут быть массивами.
+    """
+
+    __slots__ = ('value', 'derivative')
+
+    def __init__(self, value, derivative=0.0):
+        self.value = value
+        self.derivative = derivative
+
+    def __repr__(self):
+        return f"Dual({self.value!r}, {self.derivative!r})"
+
+    # --- арифметика ---
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value + other.value, self.derivative + other.derivative)
+        return Dual(self.value + other, self.derivative)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value - other.value, self.derivative - other.derivative)
+        return Dual(self.value - other, self.derivative)
+
+    def __rsub__(self, other):
+        return Dual(other - self.value, -self.derivative)
+
+    def __mul__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value * other.value,
+                        self.derivative * other.value + self.value * other.derivative)
+        return Dual(self.value * other, self.derivative * other)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, Dual):
+            return Dual(self.value / other.value,
+                        (self.derivative * other.value - self.value * other.derivative) / other.value ** 2)
+        return Dual(self.value / other, self.derivative / other)
+
+    def __rtruediv__(self, other):
+        return Dual(other / self.value, -other * self.derivative / self.value ** 2)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            value = self.value ** other.value
+            return Dual(value, value * (other.derivative * np.log(self.value)
+                                        + other.value * self.derivative / self.value))
+        return Dual(self.value ** other, other * self.value ** (other - 1) * self.derivative)
+
+    def __rpow__(self, other):
+        value = other ** self.value
+        return Dual(value, value * np.log(other) * self.derivative)
+
+    def __neg__(self):
+        return Dual(-self.value, -self.derivative)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.value), np.sign(self.value) * self.derivative)
+
+    # --- сравнения (по значению) ---
+    def __lt__(self, other):
+        return self.value < _value(other)
+
+    def __le__(self, other):
+        return self.value <= _value(other)
+
+    def __gt__(self, other):
+        return self.value > _value(other)
+
+    def __ge__(self, other):
+        return self.value >= _value(other)
+
+    # --- элементарные функции (их вызывают np.sin, np.cos, ...) ---
+    def sin(self):
+        return Dual(np.sin(self.value), np.cos(self.value) * self.derivative)
+
+    def cos(self):
+        return Dual(np.cos(self.value), -np.sin(self.value) * self.derivative)
+
+    def tan(self):
+        value = np.tan(self.value)
+        return Dual(value, (1 + value ** 2) * self.derivative)
+
+    def arcsin(self):
+        return Dual(np.arcsin(self.value), self.derivative / np.sqrt(1 - self.value ** 2))
+
+    def arccos(self):
+        return Dual(np.arccos(self.value), -self.derivative / np.sqrt(1 - self.value ** 2))
+
+    def arctan(self):
+        return Dual(np.arctan(self.value), self.derivative / (1 + self.value ** 2))
+
+    def sinh(self):
+        return Dual(np.sinh(self.value), np.cosh(self.value) * self.derivative)
+
+    def cosh(self):
+        return Dual(np.cosh(self.value), np.sinh(self.value) * self.derivative)
+
+    def tanh(self):
+        value = np.tanh(self.value)
+        return Dual(value, (1 - value ** 2) * self.derivative)
+
+    def exp(self):
+        value = np.exp(self.value)
+        return Dual(value, value * self.derivative)
+
+    def log(self):
+        return Dual(np.log(self.value), self.derivative / self.value)
+
+    def log10(self):
+        return Dual(np.log10(self.value), self.derivative / (self.value * np.log(10)))
+
+    def sqrt(self):
+        value = np.sqrt(self.value)
+        return Dual(value, self.derivative / (2 * value))
+
+    def absolute(self):
+        return abs(self)
+
+
+def _value(x):
+    return x.value if isinstance(x, Dual) else x
+
+
+def value_and_derivative(func, x, method='dual', h=1e-20):
+    """
+    Вычисляет значение функции и её производную в точке x
+    за одно вычисление функции.
+
+    method — 'dual' (дуальные числа) или 'complex' (комплексный шаг:
+             f'(x) ≈ Im f(x + ih) / h; подходит для функций на NumPy/cmath
+             и не теряет точность на вычитании, как конечные разности).
+    Возвращает (f(x), f'(x)).
+    """
+    if method == 'dual':
+        result = func(Dual(x, np.ones_like(x, dtype=float) if np.ndim(x) else 1.0))
+        if not isinstance(result, Dual):  # функция не зависит от x
+            return result, np.zeros_like(x, dtype=float) if np.ndim(x) else 0.0
+        return result.value, result.derivative
+    if method == 'complex':
+        result = func(np.asarray(x, dtype=float) + 1j * h if np.ndim(x) else x + 1j * h)
+        return np.real(result), np.imag(result) / h
+    raise ValueError(f"неизвестный способ дифференцирования: {method}")
+
+
+def derivative(func, method='dual'):
+    """
+    Возвращает функцию-производную func.
+    """
+    return lambda x: value_and_derivative(func, x, method)[1]
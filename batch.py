@@ -0,0 +1,208 @@
+"""
+Пакетный запуск численных методов без графического интерфейса.
+
+Задачи читаются из файла JSON (список объектов), JSON Lines или CSV
+и распределяются по процессам. Результаты выводятся в stdout
+по одной строке JSON на задачу в порядке входного файла.
+
+Поля задачи:
+    expression — функция от x (для метода iteration — функция g(x)),
+    method     — left, right, trapezoid, simpson, gauss, composite_gauss,
+                 adaptive, romberg, singular, antiderivative, bisection, brent, newton,
+                 secant, iteration, all_roots,
+    a, b       — отрезок (интегрирование, бисекция, поиск всех корней),
+    n          — число отрезков для составных правил,
+    order      — число узлов Гаусса (gauss: 20, composite_gauss: 5 на отрезок),
+    x0, x1     — начальные приближения,
+    derivative — производная для метода Ньютона (если не задана,
+                 находится символьно по выражению),
+    principal_value — для метода singular: главное значение при полюсе внутри отрезка,
+    intervals  — для метода antiderivative: список отрезков [a, b] (вместо a, b);
+                 все интегралы берутся из одной таблицы первообразной,
+                 общей для задач с тем же выражением и tol,
+    mode       — ускорение для метода iteration (plain, aitken, steffensen, anderson),
+    tol        — точность.
+
+Пример:
+    python batch.py problems.json --workers 8 > results.jsonl
+"""
+import argparse
+import csv
+import json
+import sys
+from functools import lru_cache
+from multiprocessing import Pool
+
+import numpy as np
+
+import quadrature
+import roots
+import singular
+from antiderivative import Antiderivative
+from expression import compile_expression
+from solver_trace import Trace
+
+def make_function(expression):
+    """
+    Превращает строку с выражением от x в функцию.
+    Выражение проверяется по белому списку (см. expression.py),
+    компилируется один раз и кэшируется.
+    """
+    return compile_expression(expression)
+
+
+@lru_cache(maxsize=64)
+def antiderivative_table(expression, tol):
+    """
+    Таблица первообразной для выражения (одна на процесс для каждой
+    пары выражение, tol), см. antiderivative.Antiderivative.
+    """
+    return Antiderivative(make_function(expression), tol)
+
+
+def solve(problem, trace=None):
+    """
+    Решает одну задачу и возвращает словарь с результатом.
+    trace — журнал работы метода (solver_trace.Trace), необязательный.
+    """
+    method = problem['method']
+    f = make_function(problem['expression'])
+    tol = float(problem.get('tol', 1e-10))
+    n = int(problem.get('n', 100))
+
+    if method in ('left', 'right'):
+        number = 0 if method == 'left' else 1
+        return {'value': quadrature.rectangles(f, float(problem['a']), float(problem['b']), n, number, trace=trace)}
+    if method == 'trapezoid':
+        return {'value': quadrature.trapezoid(f, float(problem['a']), float(problem['b']), n, trace=trace)}
+    if method == 'simpson':
+        return {'value': quadrature.simpson(f, float(problem['a']), float(problem['b']), n, trace=trace)}
+    if method == 'gauss':
+        order = int(problem.get('order', 20))
+        return {'value': quadrature.gauss_legendre(f, float(problem['a']), float(problem['b']), order, trace=trace)}
+    if method == 'composite_gauss':
+        order = int(problem.get('order', 5))
+        return {'value': quadrature.composite_gauss(f, float(problem['a']), float(problem['b']), n, order, trace=trace)}
+    if method == 'adaptive':
+        value, error, evaluations = quadrature.adaptive(f, float(problem['a']), float(problem['b']), tol, trace=trace)
+        return {'value': value, 'error_estimate': error, 'evaluations': evaluations}
+    if method == 'singular':
+        principal = str(problem.get('principal_value', False)).lower() in ('1', 'true', 'yes')
+        value, error, evaluations, points = singular.integrate(
+            f, float(problem['a']), float(problem['b']), tol, principal, trace=trace)
+        return {'value': value, 'error_estimate': error, 'evaluations': evaluations,
+                'singularities': [[x, kind] for x, kind in points]}
+    if method == 'antiderivative':
+        table = antiderivative_table(problem['expression'], tol)
+        if 'intervals' in problem:
+            intervals = np.array(problem['intervals'], dtype=float).reshape(-1, 2)
+            return {'values': table.integral(intervals[:, 0], intervals[:, 1], trace).tolist(),
+                    'converged': table.converged}
+        return {'value': table.integral(float(problem['a']), float(problem['b']), trace), 'converged': table.converged}
+    if method == 'romberg':
+        value, table, evaluations = quadrature.romberg(f, float(problem['a']), float(problem['b']), tol, trace=trace)
+        return {'value': value, 'evaluations': evaluations}
+    if method == 'bisection':
+        return {'value': roots.bisection(f, float(problem['a']), float(problem['b']), tol, trace=trace)}
+    if method == 'brent':
+        value, iterations, evaluations = roots.brent(f, float(problem['a']), float(problem['b']), tol, trace=trace)
+        return {'value': value, 'iterations': iterations, 'evaluations': evaluations}
+    if method == 'newton':
+        derivative = make_function(problem['derivative']) if 'derivative' in problem else f.derivative()
+        return {'value': roots.newton(f, derivative, float(problem['x0']), tol, int(problem.get('max_iter', 50)), trace=trace)}
+    if method == 'secant':
+        return {'value': roots.secant(f, float(problem['x0']), float(problem['x1']), tol, int(problem.get('max_iter', 50)), trace=trace)}
+    if method == 'iteration':
+        value, iterations, evaluations = roots.fixed_point(
+            f, float(problem['x0']), tol, int(problem.get('max_iter', 1000)),
+            problem.get('mode', 'plain'), int(problem.get('depth', 3)), trace=trace)
+        return {'value': value, 'iterations': iterations, 'evaluations': evaluations}
+    if method == 'all_roots':
+        found, evaluations = roots.find_all(f, float(problem.get('a', -10)), float(problem.get('b', 10)), trace=trace)
+        return {'roots': found.tolist(), 'evaluations': evaluations}
+    raise ValueError(f"неизвестный метод: {method}")
+
+
+def run(item):
+    """
+    Решает задачу (номер, задача, вести ли журнал) и перехватывает ошибки, чтобы одна
+    неудачная задача не останавливала весь пакет.
+    """
+    index, problem, with_trace = item
+    result = {'id': problem.get('id', index)}
+    trace = Trace() if with_trace else None
+    try:
+        result.update(solve(problem, trace))
+        if trace is not None:
+            result['trace'] = trace.summary()
+    except Exception as e:
+        # журнал прерванного метода не закончен: в результат он не попадает
+        result['error'] = f"{type(e).__name__}: {e}"
+    for key, value in result.items():
+        if isinstance(value, np.generic):
+            result[key] = value.item()
+    return result
+
+
+def _number(text):
+    for convert in (int, float):
+        try:
+            return convert(text)
+        except ValueError:
+            pass
+    return text
+
+
+def read_problems(file, fmt):
+    """
+    Читает задачи из файла в формате json, jsonl или csv.
+    """
+    if fmt == 'csv':
+        return [{key: _number(value) for key, value in row.items() if value != ''}
+                for row in csv.DictReader(file)]
+    if fmt == 'jsonl':
+        return [json.loads(line) for line in file if line.strip()]
+    return json.load(file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Пакетное решение задач интегрирования и поиска корней")
+    parser.add_argument('input', help="файл с задачами ('-' — стандартный ввод)")
+    parser.add_argument('--format', choices=('json', 'jsonl', 'csv'),
+                        help="формат входного файла (по умолчанию — по расширению)")
+    parser.add_argument('--workers', type=int, default=None, help="число процессов (по умолчанию — число ядер)")
+    parser.add_argument('--chunksize', type=int, default=64, help="задач на одну передачу процессу")
+    parser.add_argument('--trace', action='store_true',
+                        help="добавить к результату журнал метода: итерации, вычисления функции, время")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = args.input.rsplit('.', 1)[-1] if args.input.endswith(('.csv', '.jsonl')) else 'json'
+
+    if args.input == '-':
+        problems = read_problems(sys.stdin, fmt)
+    else:
+        with open(args.input, encoding='utf-8', newline='') as file:
+            problems = read_problems(file, fmt)
+
+    items = ((index, problem, args.trace) for index, problem in enumerate(problems))
+    if args.workers == 1:
+        results = map(run, items)
+        pool = None
+    else:
+        pool = Pool(args.workers)
+        results = pool.imap(run, items, args.chunksize)
+
+    try:
+        for result in results:
+            sys.stdout.write(json.dumps(result, ensure_ascii=False) + '\n')
+        sys.stdout.flush()
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Замер скорости и точности методов интегрирования и поиска корней.
+
+Каждый метод запускается на фиксированном наборе задач с известным
+ответом при разных n (числе узлов Гаусса или точности tol). Для каждого запуска
+записываются число вычислений функции, время и достигнутая погрешность.
+Результаты сохраняются в JSON; по ним можно построить диаграммы
+«работа — точность» (нужен matplotlib) и сравнить с сохранённым
+ранее результатом, чтобы заметить замедление.
+
+Примеры:
+    python bench.py --output baseline.json
+    python bench.py --output new.json --plots plots --compare baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+import quadrature
+import roots
+from solver_trace import Trace
+
+# --- Набор задач: (название, функция, a, b, точное значение) ---
+INTEGRALS = [
+    ('tan', np.tan, 0.0, 1.0, -math.log(math.cos(1.0))),
+    ('polynomial', lambda x: x ** 5 - 3 * x ** 2 + 1, 0.0, 2.0, 64 / 6 - 8 + 2),
+    ('oscillatory', lambda x: np.cos(30 * x), 0.0, 1.0, math.sin(30.0) / 30),
+    ('near_singular', lambda x: 1 / np.sqrt(x + 1e-3), 0.0, 1.0, 2 * (math.sqrt(1.001) - math.sqrt(0.001))),
+]
+
+# --- Задачи поиска корня: (название, функция, a, b, x0, точный корень) ---
+ROOTS = [
+    ('sqrt2', lambda x: x ** 2 - 2, 0.0, 2.0, 1.5, math.sqrt(2)),
+    ('cos_x', lambda x: np.cos(x) - x, 0.0, 1.0, 0.5, 0.7390851332151607),
+    ('cubic', lambda x: x ** 3 - 2 * x - 5, 2.0, 3.0, 2.5, 2.0945514815423265),
+    ('exp', lambda x: np.exp(x) - 3, 0.0, 2.0, 1.0, math.log(3)),
+]
+
+# --- Задачи на неподвижную точку x = g(x) с теми же корнями: (название, g, x0, точный корень) ---
+FIXED_POINTS = [
+    ('sqrt2', lambda x: 1 + 1 / (1 + x), 1.5, math.sqrt(2)),
+    ('cos_x', np.cos, 0.5, 0.7390851332151607),
+    ('cubic', lambda x: (2 * x + 5) ** (1 / 3), 2.5, 2.0945514815423265),
+    ('exp', lambda x: x - (np.exp(x) - 3) / 4, 1.0, math.log(3)),
+]
+
+SIZES = [10, 100, 1000, 10000, 100000]
+ORDERS = [2, 5, 10, 20, 40]
+TOLERANCES = [1e-4, 1e-6, 1e-8, 1e-10, 1e-12]
+
+# --- Методы: название -> (функция запуска, набор значений параметра) ---
+INTEGRATION_METHODS = {
+    'left': (lambda f, a, b, n, trace: quadrature.rectangles(f, a, b, n, 0, trace=trace), SIZES),
+    'right': (lambda f, a, b, n, trace: quadrature.rectangles(f, a, b, n, 1, trace=trace), SIZES),
+    'trapezoid': (lambda f, a, b, n, trace: quadrature.trapezoid(f, a, b, n, trace=trace), SIZES),
+    'simpson': (lambda f, a, b, n, trace: quadrature.simpson(f, a, b, n, trace=trace), SIZES),
+    'composite_gauss': (lambda f, a, b, n, trace: quadrature.composite_gauss(f, a, b, n, trace=trace), SIZES),
+    'gauss_legendre': (lambda f, a, b, order, trace: quadrature.gauss_legendre(f, a, b, order, trace=trace), ORDERS),
+    'adaptive': (lambda f, a, b, tol, trace: quadrature.adaptive(f, a, b, tol, trace=trace)[0], TOLERANCES),
+    'romberg': (lambda f, a, b, tol, trace: quadrature.romberg(f, a, b, tol, trace=trace)[0], TOLERANCES),
+}
+
+ROOT_METHODS = {
+    'bisection': lambda f, a, b, x0, tol, trace: roots.bisection(f, a, b, tol, trace=trace),
+    'brent': lambda f, a, b, x0, tol, trace: roots.brent(f, a, b, tol, trace=trace)[0],
+    'newton': lambda f, a, b, x0, tol, trace: roots.newton(f, None, x0, tol, 100, trace=trace),
+    'secant': lambda f, a, b, x0, tol, trace: roots.secant(f, x0, b, tol, 100, trace=trace),
+}
+
+FIXED_POINT_METHODS = {
+    'fixed_point_' + mode: lambda g, x0, tol, trace, mode=mode: roots.fixed_point(g, x0, tol, 200, mode, trace=trace)[0]
+    for mode in ('plain', 'aitken', 'steffensen', 'anderson')
+}
+
+
+# Наименьшая длительность одной серии замера (нс): одиночный запуск
+# в десятки микросекунд измеряется с большим шумом.
+MIN_TIME_NS = 10_000_000
+
+
+def measure(run, repeat, min_time_ns=MIN_TIME_NS):
+    """
+    Замеряет run(trace) как timeit.autorange: число запусков в серии
+    удваивается, пока серия не займёт min_time_ns, затем серия
+    повторяется repeat раз. Журнал ведётся в отдельном запуске,
+    чтобы его накладные расходы не попадали во время.
+
+    Возвращает (результат, журнал, наименьшее время одного запуска в нс).
+    """
+    trace = Trace()
+    value = run(trace)
+
+    loops = 1
+    while True:
+        elapsed = _series(run, loops)
+        if elapsed >= min_time_ns:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        best = min(best, _series(run, loops) / loops)
+    return value, trace, round(best)
+
+
+def _series(run, loops):
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        run(None)
+    return time.perf_counter_ns() - start
+
+
+def benchmark_cases():
+    """
+    Список запусков: (вид, задача, метод, параметр, точный ответ, run(trace)).
+    """
+    cases = []
+    for problem, f, a, b, exact in INTEGRALS:
+        for method, (integrate, parameters) in INTEGRATION_METHODS.items():
+            for parameter in parameters:
+                run = lambda trace, f=f, a=a, b=b, integrate=integrate, parameter=parameter: integrate(f, a, b, parameter, trace)
+                cases.append(('integral', problem, method, parameter, exact, run))
+
+    for problem, f, a, b, x0, exact in ROOTS:
+        for method, solve in ROOT_METHODS.items():
+            for tol in TOLERANCES:
+                run = lambda trace, f=f, a=a, b=b, x0=x0, solve=solve, tol=tol: solve(f, a, b, x0, tol, trace)
+                cases.append(('root', problem, method, tol, exact, run))
+
+    for problem, g, x0, exact in FIXED_POINTS:
+        for method, solve in FIXED_POINT_METHODS.items():
+            for tol in TOLERANCES:
+                run = lambda trace, g=g, x0=x0, solve=solve, tol=tol: solve(g, x0, tol, trace)
+                cases.append(('root', problem, method, tol, exact, run))
+    return cases
+
+
+def run_benchmarks(repeat=3, min_time_ns=MIN_TIME_NS, cases=None):
+    """
+    Запускает все методы на всех задачах (или только cases).
+    Возвращает список записей (словарей).
+
+    Весь набор проходится repeat раз, и для каждого запуска берётся
+    лучшее время: серии одного запуска разнесены во времени, и временное
+    замедление машины не испортит их все сразу.
+    """
+    if cases is None:
+        cases = benchmark_cases()
+    records = []
+    for attempt in range(repeat):
+        for index, (kind, problem, method, parameter, exact, run) in enumerate(cases):
+            value, trace, elapsed = measure(run, 1, min_time_ns)
+            if attempt == 0:
+                records.append(_record(kind, problem, method, parameter, value, exact, trace, elapsed))
+            else:
+                records[index]['time_ns'] = min(records[index]['time_ns'], elapsed)
+    return records
+
+
+def _record(kind, problem, method, parameter, value, exact, trace, elapsed):
+    return {
+        'kind': kind,
+        'problem': problem,
+        'method': method,
+        'parameter': parameter,
+        'evaluations': trace.evaluations,
+        'time_ns': elapsed,
+        'error': abs(float(value) - exact),
+    }
+
+
+def compare(records, baseline, time_factor=1.5, error_factor=10.0, time_floor_ns=5_000):
+    """
+    Сравнивает результаты с базовыми и возвращает список регрессий:
+    запуски, ставшие медленнее в time_factor раз (и не меньше чем на
+    time_floor_ns — разница в единицы микросекунд остаётся шумом),
+    потребовавшие больше вычислений функции или потерявшие точность
+    в error_factor раз.
+
+    Скорость машины между запусками меняется (частота процессора,
+    соседние задачи), поэтому базовые времена сначала умножаются на
+    медиану отношений «сейчас / база» по всем запускам: общее замедление
+    машины сдвигает все времена, а регрессия — только некоторые.
+    Замедление сразу всех методов одинаково такое сравнение не заметит.
+    """
+    old = {(r['problem'], r['method'], r['parameter']): r for r in baseline}
+    ratios = [record['time_ns'] / old[key]['time_ns'] for record in records
+              if (key := (record['problem'], record['method'], record['parameter'])) in old]
+    speed = float(np.median(ratios)) if ratios else 1.0
+    regressions = []
+    for record in records:
+        key = (record['problem'], record['method'], record['parameter'])
+        if key not in old:
+            continue
+        before = old[key]
+        reasons = []
+        expected = before['time_ns'] * speed
+        if record['time_ns'] > time_factor * expected and record['time_ns'] - expected > time_floor_ns:
+            reasons.append(f"время {before['time_ns']} -> {record['time_ns']} нс (с поправкой на скорость машины {speed:.2f})")
+        if record['evaluations'] > before['evaluations']:
+            reasons.append(f"вычислений {before['evaluations']} -> {record['evaluations']}")
+        if record['error'] > error_factor * max(before['error'], 1e-15):
+            reasons.append(f"погрешность {before['error']:.3g} -> {record['error']:.3g}")
+        if reasons:
+            regressions.append({'problem': key[0], 'method': key[1], 'parameter': key[2], 'reasons': reasons})
+    return regressions
+
+
+def plot(records, directory):
+    """
+    Строит диаграммы «работа — точность» (по одной на задачу):
+    по оси x — погрешность, по оси y — время и число вычислений.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    os.makedirs(directory, exist_ok=True)
+    problems = sorted({(r['kind'], r['problem']) for r in records})
+    for kind, problem in problems:
+        figure, (ax_time, ax_evals) = plt.subplots(1, 2, figsize=(12, 5))
+        selected = [r for r in records if r['problem'] == problem]
+        for method in dict.fromkeys(r['method'] for r in selected):
+            points = sorted(((max(r['error'], 1e-17), r['time_ns'] / 1e6, r['evaluations'])
+                             for r in selected if r['method'] == method), key=lambda point: point[2])
+            errors, times, evaluations = zip(*points)
+            ax_time.loglog(errors, times, 'o-', label=method)
+            ax_evals.loglog(errors, evaluations, 'o-', label=method)
+        for ax, label in ((ax_time, 'время, мс'), (ax_evals, 'вычислений функции')):
+            ax.set_xlabel('погрешность')
+            ax.set_ylabel(label)
+            ax.invert_xaxis()
+            ax.grid(True, which='both', alpha=0.3)
+        ax_time.legend()
+        figure.suptitle(f"{kind}: {problem}")
+        figure.savefig(os.path.join(directory, f"{kind}_{problem}.png"), dpi=100)
+        plt.close(figure)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Замер скорости и точности численных методов")
+    parser.add_argument('--output', default='-', help="файл для результатов JSON ('-' — стандартный вывод)")
+    parser.add_argument('--repeat', type=int, default=3, help="серий замера каждого запуска (берётся лучшее время)")
+    parser.add_argument('--min-time', type=float, default=MIN_TIME_NS / 1e6,
+                        help="наименьшая длительность одной серии, мс")
+    parser.add_argument('--plots', help="папка для диаграмм «работа — точность» (нужен matplotlib)")
+    parser.add_argument('--compare', help="файл с базовыми результатами для поиска регрессий")
+    parser.add_argument('--time-factor', type=float, default=1.5, help="допустимое замедление относительно базы")
+    parser.add_argument('--time-floor', type=float, default=5.0,
+                        help="замедление меньше стольких микросекунд не считается регрессией")
+    args = parser.parse_args(argv)
+
+    records = run_benchmarks(args.repeat, round(args.min_time * 1e6))
+    report = {'results': records}
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)['results']
+        report['regressions'] = compare(records, baseline, args.time_factor,
+                                        time_floor_ns=round(args.time_floor * 1e3))
+        if report['regressions']:
+            # подозрительные запуски замеряются ещё раз: одиночный всплеск
+            # нагрузки на машину не должен выглядеть как регрессия
+            suspects = {(r['problem'], r['method'], r['parameter']) for r in report['regressions']}
+            cases = [case for case in benchmark_cases() if (case[1], case[2], case[3]) in suspects]
+            again = run_benchmarks(2 * args.repeat, round(args.min_time * 1e6), cases)
+            again = {(r['problem'], r['method'], r['parameter']): r['time_ns'] for r in again}
+            for record in records:
+                key = (record['problem'], record['method'], record['parameter'])
+                if key in again:
+                    record['time_ns'] = min(record['time_ns'], again[key])
+            report['regressions'] = compare(records, baseline, args.time_factor,
+                                            time_floor_ns=round(args.time_floor * 1e3))
+
+    text = json.dumps(report, ensure_ascii=False, indent=1)
+    if args.output == '-':
+        print(text)
+    else:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text)
+
+    if args.plots:
+        try:
+            plot(records, args.plots)
+        except ImportError:
+            print("matplotlib не установлен: диаграммы не построены", file=sys.stderr)
+
+    for regression in report.get('regressions', []):
+        print(f"РЕГРЕССИЯ {regression['problem']}/{regression['method']} ({regression['parameter']}): "
+              + '; '.join(regression['reasons']), file=sys.stderr)
+    return 1 if report.get('regressions') else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
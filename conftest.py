@@ -0,0 +1 @@
+# Корень репозитория попадает в sys.path, и тесты из tests/ импортируют модули напрямую.
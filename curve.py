@@ -0,0 +1,198 @@
+import math
+
+import numpy as np
+
+# Фигуры методов (прямоугольники, трапеции, параболы) уже этой ширины
+# в пикселях рисуются не по одной, а общей огибающей (см. draw_envelope).
+MIN_SHAPE_WIDTH = 3
+
+
+def split_runs(points, max_jump=math.inf):
+    """
+    Делит последовательность точек экрана на непрерывные участки.
+
+    Участок обрывается на точках с нечисловыми координатами (nan, inf)
+    и там, где соседние точки отличаются по y больше чем на max_jump
+    пикселей (разрыв функции, например полюс tan(x)).
+
+    points — последовательность пар (x, y) в координатах холста,
+    max_jump — наибольший допустимый скачок по y между соседними точками.
+    """
+    run = []
+    for x, y in points:
+        if not (math.isfinite(x) and math.isfinite(y)):
+            if run:
+                yield run
+            run = []
+            continue
+        if run and abs(y - run[-1][1]) > max_jump:
+            yield run
+            run = []
+        run.append((x, y))
+    if run:
+        yield run
+
+
+def draw_curve(canvas, points, max_jump=None, **options):
+    """
+    Рисует кривую по точкам: одна линия Tk на каждый непрерывный участок
+    вместо отдельной линии на каждый отрезок.
+
+    canvas — холст Tkinter,
+    points — последовательность пар (x, y) в координатах холста,
+    max_jump — скачок по y, после которого линия разрывается
+               (по умолчанию — высота холста),
+    options — параметры create_line (fill, width, ...).
+    Возвращает список идентификаторов созданных линий.
+    """
+    if max_jump is None:
+        max_jump = float(canvas['height'])
+    items = []
+    for run in split_runs(points, max_jump):
+        if len(run) > 1:
+            coords = [c for point in run for c in point]
+            items.append(canvas.create_line(coords, **options))
+    return items
+
+
+def draw_envelope(canvas, xs, ys, baseline, **options):
+    """
+    Рисует одним многоугольником область между осью и профилем фигур,
+    собранную по столбцам пикселей.
+
+    Когда фигур больше, чем пикселей, в каждом столбце всё равно видна
+    только общая закрашенная полоса: от наименьшего до наибольшего y
+    фигур в этом столбце (и оси). Многоугольник состоит из этих полос,
+    поэтому число его вершин зависит от ширины на экране, а не от n.
+
+    canvas — холст Tkinter,
+    xs, ys — верхний профиль фигур в координатах холста: точки по
+             возрастанию x, между ними профиль линейный (для ступенек
+             x повторяется),
+    baseline — y оси на холсте,
+    options — параметры create_polygon (fill, outline, ...).
+    Возвращает идентификатор многоугольника или None.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    height = float(canvas['height'])
+    finite = np.isfinite(xs) & np.isfinite(ys)
+    xs, ys = xs[finite], np.clip(ys[finite], -height, 2 * height)
+    if xs.size < 2:
+        return None
+
+    first = math.floor(xs[0])
+    count = max(1, math.ceil(xs[-1]) - first)
+    centers = first + np.arange(count) + 0.5
+    # профиль в середине каждого столбца и во всех точках излома
+    px = np.concatenate((xs, centers))
+    py = np.concatenate((ys, np.interp(centers, xs, ys)))
+    column = np.clip(np.floor(px).astype(int) - first, 0, count - 1)
+
+    low = np.full(count, float(baseline))
+    high = np.full(count, float(baseline))
+    np.minimum.at(low, column, py)
+    np.maximum.at(high, column, py)
+
+    left = first + np.arange(count, dtype=float)
+    top = np.column_stack((np.repeat(left, 2) + np.tile([0.0, 1.0], count), np.repeat(low, 2)))
+    bottom = np.column_stack((np.repeat(left, 2) + np.tile([0.0, 1.0], count), np.repeat(high, 2)))[::-1]
+    coords = np.concatenate((top, bottom)).ravel().tolist()
+    return canvas.create_polygon(coords, **options)
+
+
+def adaptive_sample(function, start, finish, scale, y_range=None, tolerance=0.5, initial=64, max_depth=10):
+    """
+    Точки графика функции, сгущённые там, где он изгибается.
+
+    Отрезок сначала делится на initial равных частей. Функция вычисляется
+    в точках 1/3 и 2/3 каждой части; если график там отстоит от хорды
+    больше чем на tolerance пикселей, часть делится на три и проверяется
+    снова. На прямых участках точек мало, на изгибах много. Части,
+    которые целиком выше или ниже видимой полосы y_range, не уточняются.
+    Если часть уже уже 1/16 пикселя, а график на ней всё ещё не похож
+    на отрезок и скачет больше чем на 4 пикселя, это разрыв или полюс
+    (например, у tan(x)): там в результат вставляется точка с y = nan,
+    и линия обрывается.
+
+    function — функция (вызывается с массивами NumPy),
+    start, finish — отрезок по x,
+    scale — пикселей на единицу,
+    y_range — (нижняя, верхняя) граница видимой полосы по y или None.
+    Возвращает (x, y, число вычислений функции) — массивы в координатах
+    задачи, упорядоченные по x.
+    """
+    from quadrature import evaluate
+
+    def values(x):
+        y = evaluate(function, x, fill=np.nan)
+        return np.where(np.isfinite(y), y, np.nan)
+
+    x = np.linspace(start, finish, initial + 1)
+    y = values(x)
+    xs, ys = [x], [y]
+    evaluations = x.size
+    breaks = []
+    low, high = y_range if y_range is not None else (-math.inf, math.inf)
+
+    left, right, y_left, y_right = x[:-1], x[1:], y[:-1], y[1:]
+    for depth in range(max_depth + 1):
+        if left.size == 0:
+            break
+        width = right - left
+        x1, x2 = left + width / 3, right - width / 3
+        y1, y2 = values(np.concatenate((x1, x2))).reshape(2, -1)
+        xs += [x1, x2]
+        ys += [y1, y2]
+        evaluations += 2 * x1.size
+
+        slope = y_right - y_left
+        deviation = np.fmax(np.abs(y1 - y_left - slope / 3), np.abs(y2 - y_left - 2 * slope / 3)) * scale
+        corners = np.stack((y_left, y1, y2, y_right))
+        known = np.isfinite(corners)
+        with np.errstate(invalid='ignore'):
+            hidden = (np.nanmin(np.where(known, corners, np.inf), axis=0) > high) | \
+                     (np.nanmax(np.where(known, corners, -np.inf), axis=0) < low)
+            bad = ((deviation > tolerance) | (~known.all(axis=0) & known.any(axis=0))) & ~hidden
+
+        narrow = width * scale < 1 / 16
+        if depth == max_depth:
+            narrow[:] = True
+        # разрыв ищется в той трети, где скачок наибольший
+        steps = np.abs(np.diff(corners, axis=0)) * scale
+        with np.errstate(invalid='ignore'):
+            jump = known.all(axis=0) & (np.nanmax(steps, axis=0) > 4)
+        done = bad & narrow & jump
+        third = np.argmax(np.nan_to_num(steps[:, done], nan=0.0), axis=0)
+        breaks.append(left[done] + (third + 0.5) * width[done] / 3)
+
+        refine = bad & ~narrow
+        points = np.stack((left, x1, x2, right))[:, refine]
+        values_at = corners[:, refine]
+        left, right = points[:-1].ravel(), points[1:].ravel()
+        y_left, y_right = values_at[:-1].ravel(), values_at[1:].ravel()
+
+    breaks = np.concatenate(breaks)
+    x = np.concatenate(xs + [breaks])
+    y = np.concatenate(ys + [np.full(breaks.size, np.nan)])
+    order = np.argsort(x, kind='stable')
+    return x[order], y[order], evaluations
+
+
+def plot_adaptive(canvas, function, start, finish, scale, origin_x, origin_y, tolerance=0.5, **options):
+    """
+    Рисует график функции по точкам adaptive_sample: с точностью около
+    tolerance пикселя и с обрывами линии в разрывах и полюсах.
+
+    canvas — холст Tkinter,
+    function — функция (вызывается с массивами NumPy),
+    start, finish — отрезок по x,
+    scale — пикселей на единицу,
+    origin_x, origin_y — положение начала координат на холсте,
+    options — параметры create_line (fill, width, ...).
+    Возвращает список идентификаторов созданных линий.
+    """
+    height = float(canvas['height'])
+    x, y, _ = adaptive_sample(function, start, finish, scale,
+                              ((origin_y - height) / scale, origin_y / scale), tolerance)
+    return draw_curve(canvas, zip(origin_x + x * scale, origin_y - y * scale), **options)
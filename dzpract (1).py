@@ -1,5 +1,7 @@
 import tkinter as tk
 import math
+from curve import plot_adaptive
+import roots
 
 def create_canvas(window, width=800, height=600, bg_color='white'):
     """
@@ -53,36 +55,24 @@ def plot_function(canvas, func, x_range, origin_x, origin_y, step=50, color='blu
     step: Масштабный коэффициент (по умолчанию 50).
     color: Цвет линии графика (по умолчанию синий).
     """
-    prev_x, prev_y = None, None  # Переменные для хранения предыдущих точек
-    for x in range(x_range[0] * step, x_range[1] * step):  # Перебираем точки
-        real_x = x / step  # Преобразуем координату X в реальное значение
-        real_y = func(real_x)  # Вычисляем Y
-        screen_x = origin_x + x  # Переводим в координаты холста
-        screen_y = origin_y - real_y * step  # Инвертируем Y для отображения на экране
-        if prev_x is not None:
-            canvas.create_line(prev_x, prev_y, screen_x, screen_y, fill=color)  # Рисуем линию между точками
-        prev_x, prev_y = screen_x, screen_y  # Обновляем предыдущие точки
+    # Точки сгущаются там, где график изгибается, и не ставятся на прямых участках
+    plot_adaptive(canvas, func, x_range[0], x_range[1], step, origin_x, origin_y, fill=color)
 
-def find_root(func, a, b, precision=0.001):
+def find_root(func, a, b, precision=0.001, trace=None):
     """
-    Находит корень уравнения f(x) = 0 методом бисекции.
+    Находит корень уравнения f(x) = 0 методом Брента
+    (бисекция + секущие + обратная квадратичная интерполяция).
     
     func: Функция, для которой ищется корень.
     a: Левая граница поиска.
-    b: Правая граница поиска.
+    b: Правая граница поиска (на концах отрезка функция должна иметь разные знаки).
     precision: Точность вычисления корня (по умолчанию 0.001).
+    trace: Журнал работы метода (solver_trace.Trace, по умолчанию не ведётся).
     return: Приближенное значение корня.
     """
-    while abs(b - a) > precision:  # Пока разница больше точности
-        mid = (a + b) / 2  # Находим середину отрезка
-        if func(mid) == 0:
-            return mid  # Если нашли точный корень
-        elif func(mid) * func(a) < 0:
-            b = mid  # Корень в левой половине
-        else:
-            a = mid  # Корень в правой половине
-    root = (a + b) / 2  # Возвращаем приближенное значение
+    root, iterations, evaluations = roots.brent(func, a, b, precision, trace=trace)
     print(f"Корень: {root:.3f}, 0.000")  # Выводим корень функции
+    print(f"Итераций: {iterations}, вычислений функции: {evaluations}")
     return root
 
 def highlight_root(canvas, root, origin_x, origin_y, step=50, color='red'):
@@ -117,8 +107,8 @@ def main():
     # Строим график перевёрнутой параболы
     plot_function(canvas, lambda x: -x**2 + 2, (-5, 5), center_x, center_y, step=scale)
     
-    # Находим корень функции -x^2 + 2 в интервале от -2 до 2
-    root_x = find_root(lambda x: -x**2 + 2, -2, 2)
+    # Находим корень функции -x^2 + 2 в интервале от -2 до 0 (на концах разные знаки)
+    root_x = find_root(lambda x: -x**2 + 2, -2, 0)
     highlight_root(canvas, root_x, center_x, center_y, step=scale)  # Выделяем найденный корень
     
     # Выводим координаты точки пересечения с осью Y
@@ -0,0 +1,300 @@
+"""
+Безопасный разбор формул, введённых пользователем.
+
+Строка вида "tan(x) - x**2 / 2" разбирается модулем ast, и каждый узел
+дерева проверяется по белому списку: числа, переменная x, константы
+pi и e, арифметика (+ - * / ** и ^ как степень) и функции из FUNCTIONS.
+Всё остальное (атрибуты, индексы, лямбды, импорты, вызовы других
+функций) отклоняется с ExpressionError, поэтому выполнить через формулу
+произвольный код нельзя.
+
+Проверенное дерево компилируется один раз в две функции: скалярную
+(через math, быстрее на отдельных числах) и векторную (через NumPy,
+для массивов). Результаты кэшируются по тексту формулы.
+"""
+import ast
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+class ExpressionError(ValueError):
+    """
+    Формула содержит недопустимую конструкцию или синтаксическую ошибку.
+    """
+
+
+# --- Разрешённые функции: имя -> (вариант для NumPy, вариант для чисел) ---
+FUNCTIONS = {
+    'sin': (np.sin, math.sin),
+    'cos': (np.cos, math.cos),
+    'tan': (np.tan, math.tan),
+    'arcsin': (np.arcsin, math.asin),
+    'arccos': (np.arccos, math.acos),
+    'arctan': (np.arctan, math.atan),
+    'sinh': (np.sinh, math.sinh),
+    'cosh': (np.cosh, math.cosh),
+    'tanh': (np.tanh, math.tanh),
+    'exp': (np.exp, math.exp),
+    'log': (np.log, math.log),
+    'log10': (np.log10, math.log10),
+    'sqrt': (np.sqrt, math.sqrt),
+    'abs': (np.abs, abs),
+}
+CONSTANTS = {'pi': math.pi, 'e': math.e}
+
+_OPERATORS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+
+
+class _Check(ast.NodeTransformer):
+    """
+    Проверяет дерево по белому списку.
+    """
+
+    def generic_visit(self, node):
+        raise ExpressionError(f"недопустимая конструкция: {type(node).__name__}")
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"недопустимая константа: {node.value!r}")
+        # целые числа — тоже float: иначе 9**9**9 считается длинной арифметикой
+        # минуты, держа GIL, а с float сразу даёт OverflowError
+        node.value = float(node.value)
+        return node
+
+    def visit_Name(self, node):
+        if node.id != 'x' and node.id not in CONSTANTS:
+            raise ExpressionError(f"неизвестное имя: {node.id}")
+        return node
+
+    def visit_BinOp(self, node):
+        if not isinstance(node.op, _OPERATORS):
+            raise ExpressionError(f"недопустимая операция: {type(node.op).__name__}")
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if not isinstance(node.op, (ast.UAdd, ast.USub)):
+            raise ExpressionError(f"недопустимая операция: {type(node.op).__name__}")
+        node.operand = self.visit(node.operand)
+        return node
+
+    def visit_Call(self, node):
+        if not isinstance(node.func, ast.Name):
+            raise ExpressionError(f"недопустимая конструкция: {type(node.func).__name__}")
+        if node.func.id not in FUNCTIONS:
+            raise ExpressionError(f"неизвестная функция: {node.func.id}")
+        if len(node.args) != 1 or node.keywords:
+            raise ExpressionError(f"функция {node.func.id} принимает один аргумент")
+        node.args = [self.visit(node.args[0])]
+        return node
+
+
+def parse(text):
+    """
+    Разбирает формулу и проверяет её. Возвращает дерево ast.Expression.
+    Знак ^ понимается как степень (с приоритетом **).
+    """
+    try:
+        tree = ast.parse(text.strip().replace('^', '**'), mode='eval')
+    except SyntaxError as e:
+        raise ExpressionError(f"синтаксическая ошибка: {e.msg}") from None
+    return ast.fix_missing_locations(_Check().visit(tree))
+
+
+class Expression:
+    """
+    Скомпилированная формула от x.
+
+    Вызов с числом использует скалярный вариант (math), с массивом
+    NumPy или дуальным числом (autodiff.Dual) — векторный. Атрибуты
+    scalar и vector дают эти варианты напрямую, text — текст формулы.
+    """
+
+    def __init__(self, text, tree):
+        self.text = text
+        self.tree = tree
+        code = compile(tree, '<expression>', 'eval')
+        scalar_names = {name: pair[1] for name, pair in FUNCTIONS.items()}
+        vector_names = {name: pair[0] for name, pair in FUNCTIONS.items()}
+        scalar_names.update(CONSTANTS, __builtins__={})
+        vector_names.update(CONSTANTS, __builtins__={})
+
+        def scalar(x):
+            value = eval(code, scalar_names, {'x': x})
+            if isinstance(value, complex):
+                raise ValueError(f"значение не вещественное при x = {x}")
+            return value
+
+        def vector(x):
+            return eval(code, vector_names, {'x': x})
+
+        self.scalar = scalar
+        self.vector = vector
+        self._derivative = None
+
+    def __call__(self, x):
+        if isinstance(x, (int, float)):
+            return self.scalar(float(x))
+        return self.vector(x)
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    def __reduce__(self):
+        # для передачи в другой процесс (см. parallel.py): там формула компилируется заново
+        return compile_expression, (self.text,)
+
+    def derivative(self):
+        """
+        Возвращает производную формулы (тоже Expression), найденную
+        символьно. Вычисляется один раз.
+        """
+        if self._derivative is None:
+            tree = ast.Expression(body=_simplify(_derive(self.tree.body)))
+            tree = ast.fix_missing_locations(tree)
+            self._derivative = Expression(ast.unparse(tree), tree)
+        return self._derivative
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """
+    Проверяет и компилирует формулу. Результат кэшируется по тексту,
+    поэтому повторные вызовы с той же строкой ничего не пересчитывают.
+    """
+    return Expression(text.strip(), parse(text))
+
+
+# --- Символьное дифференцирование ---
+
+def _number(value):
+    return ast.Constant(value=value)
+
+
+def _call(name, argument):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[argument], keywords=[])
+
+
+def _op(left, op, right):
+    return ast.BinOp(left=left, op=op, right=right)
+
+
+def _is_number(node, value=None):
+    return isinstance(node, ast.Constant) and (value is None or node.value == value)
+
+
+def _depends(node):
+    """
+    Зависит ли поддерево от x.
+    """
+    return any(isinstance(n, ast.Name) and n.id == 'x' for n in ast.walk(node))
+
+
+# производные функций: f(u) -> f'(u) (множитель u' добавляется отдельно)
+_RULES = {
+    'sin': lambda u: _call('cos', u),
+    'cos': lambda u: ast.UnaryOp(op=ast.USub(), operand=_call('sin', u)),
+    'tan': lambda u: _op(_number(1), ast.Div(), _op(_call('cos', u), ast.Pow(), _number(2))),
+    'arcsin': lambda u: _op(_number(1), ast.Div(), _call('sqrt', _op(_number(1), ast.Sub(), _op(u, ast.Pow(), _number(2))))),
+    'arccos': lambda u: _op(_number(-1), ast.Div(), _call('sqrt', _op(_number(1), ast.Sub(), _op(u, ast.Pow(), _number(2))))),
+    'arctan': lambda u: _op(_number(1), ast.Div(), _op(_number(1), ast.Add(), _op(u, ast.Pow(), _number(2)))),
+    'sinh': lambda u: _call('cosh', u),
+    'cosh': lambda u: _call('sinh', u),
+    'tanh': lambda u: _op(_number(1), ast.Div(), _op(_call('cosh', u), ast.Pow(), _number(2))),
+    'exp': lambda u: _call('exp', u),
+    'log': lambda u: _op(_number(1), ast.Div(), u),
+    'log10': lambda u: _op(_number(1), ast.Div(), _op(u, ast.Mult(), _call('log', _number(10)))),
+    'sqrt': lambda u: _op(_number(1), ast.Div(), _op(_number(2), ast.Mult(), _call('sqrt', u))),
+    'abs': lambda u: _op(u, ast.Div(), _call('abs', u)),
+}
+
+
+def _derive(node):
+    """
+    Производная поддерева по x (дерево без упрощений).
+    """
+    if not _depends(node):
+        return _number(0)
+    if isinstance(node, ast.Name):
+        return _number(1)
+    if isinstance(node, ast.UnaryOp):
+        return ast.UnaryOp(op=node.op, operand=_derive(node.operand))
+    if isinstance(node, ast.Call):
+        u = node.args[0]
+        return _op(_RULES[node.func.id](u), ast.Mult(), _derive(u))
+
+    u, v = node.left, node.right
+    du, dv = _derive(u), _derive(v)
+    if isinstance(node.op, (ast.Add, ast.Sub)):
+        return _op(du, node.op, dv)
+    if isinstance(node.op, ast.Mult):
+        return _op(_op(du, ast.Mult(), v), ast.Add(), _op(u, ast.Mult(), dv))
+    if isinstance(node.op, ast.Div):
+        numerator = _op(_op(du, ast.Mult(), v), ast.Sub(), _op(u, ast.Mult(), dv))
+        return _op(numerator, ast.Div(), _op(v, ast.Pow(), _number(2)))
+    # степень
+    if not _depends(v):
+        power = _op(u, ast.Pow(), _op(v, ast.Sub(), _number(1)))
+        return _op(_op(v, ast.Mult(), power), ast.Mult(), du)
+    # u**v = exp(v·log u)
+    inner = _op(_op(dv, ast.Mult(), _call('log', u)), ast.Add(), _op(_op(v, ast.Mult(), du), ast.Div(), u))
+    return _op(node, ast.Mult(), inner)
+
+
+def _simplify(node):
+    """
+    Убирает из дерева очевидные нули и единицы (0·u, 1·u, u + 0, u**1)
+    и сворачивает действия над числами.
+    """
+    if isinstance(node, ast.UnaryOp):
+        operand = _simplify(node.operand)
+        if _is_number(operand) and isinstance(node.op, ast.USub):
+            return _number(-operand.value)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        return ast.UnaryOp(op=node.op, operand=operand)
+    if isinstance(node, ast.Call):
+        return _call(node.func.id, _simplify(node.args[0]))
+    if not isinstance(node, ast.BinOp):
+        return node
+
+    left, right, op = _simplify(node.left), _simplify(node.right), node.op
+    if _is_number(left) and _is_number(right) and not isinstance(op, (ast.Div, ast.Pow)):
+        value = {ast.Add: left.value + right.value, ast.Sub: left.value - right.value,
+                 ast.Mult: left.value * right.value}[type(op)]
+        return _number(value)
+    if isinstance(op, ast.Add):
+        if _is_number(left, 0):
+            return right
+        if _is_number(right, 0):
+            return left
+    if isinstance(op, ast.Sub):
+        if _is_number(right, 0):
+            return left
+        if _is_number(left, 0):
+            return _simplify(ast.UnaryOp(op=ast.USub(), operand=right))
+    if isinstance(op, ast.Mult):
+        if _is_number(left, 0) or _is_number(right, 0):
+            return _number(0)
+        if _is_number(left, 1):
+            return right
+        if _is_number(right, 1):
+            return left
+    if isinstance(op, ast.Div):
+        if _is_number(left, 0):
+            return _number(0)
+        if _is_number(right, 1):
+            return left
+    if isinstance(op, ast.Pow):
+        if _is_number(right, 1):
+            return left
+        if _is_number(right, 0):
+            return _number(1)
+    return _op(left, op, right)
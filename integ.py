@@ -1,14 +1,17 @@
 import tkinter as tk
-import math
+import numpy as np
+import quadrature
+from curve import draw_envelope, plot_adaptive, MIN_SHAPE_WIDTH
+from scene import Scene
 
 def f(x):
     """
     Функция для интегрирования.
     Здесь по умолчанию используется tan(x).
     """
-    return math.tan(x)
+    return np.tan(x)
 
-def method_rectangles(start, finish, function, num, number):
+def method_rectangles(start, finish, function, num, number, trace=None):
     """
     Вычисляет приближённое значение определённого интеграла
     методом левых или правых прямоугольников.
@@ -17,22 +20,10 @@ def method_rectangles(start, finish, function, num, number):
     finish — конец интервала,
     function — функция для интегрирования,
     num — количество прямоугольников,
-    number — тип метода (0 — левых, 1 — правых прямоугольников).
+    number — тип метода (0 — левых, 1 — правых прямоугольников),
+    trace — журнал работы метода (solver_trace.Trace), необязательный.
     """
-    s = 0
-    h = (finish - start) / num
-
-    if number == 0:  # метод левых прямоугольников
-        x = start
-        for i in range(num):
-            s += function(x) * h
-            x += h
-    elif number == 1:  # метод правых прямоугольников
-        x = start + h
-        for i in range(num):
-            s += function(x) * h
-            x += h
-    return s
+    return quadrature.rectangles(function, start, finish, num, number, trace=trace)
 
 def draw_met_rect(function, start, finish, num, scale, center_x, center_y, number, fill='darkorange'):
     """
@@ -47,6 +38,14 @@ def draw_met_rect(function, start, finish, num, scale, center_x, center_y, numbe
     fill — цвет прямоугольников.
     """
     h = (finish - start) / num
+    if h * scale < MIN_SHAPE_WIDTH:
+        # прямоугольники уже нескольких пикселей: одна огибающая вместо n фигур
+        x = quadrature.grid(start, finish, num)
+        y = quadrature.evaluate(function, x[:-1] if number == 0 else x[1:], fill=np.nan)
+        edges = center_x + x * scale
+        draw_envelope(canv, np.repeat(edges, 2)[1:-1], center_y - np.repeat(y, 2) * scale, center_y,
+                      fill=fill, outline=fill)
+        return
     for i in range(num):
         if number == 0:
             x = start + i * h
@@ -71,16 +70,9 @@ def draw_func(func, a, b, scale, center_x, center_y, fill='mediumblue', width=2)
     center_x, center_y — координаты центра,
     fill — цвет линии,
     width — толщина линии графика.
+    Точки сгущаются на изгибах, в полюсах tan(x) линия обрывается.
     """
-    h = 0.01
-    x = a
-    while x < b:
-        x0_screen = center_x + x * scale
-        y0_screen = center_y - func(x) * scale
-        x1_screen = center_x + (x + h) * scale
-        y1_screen = center_y - func(x + h) * scale
-        canv.create_line(x0_screen, y0_screen, x1_screen, y1_screen, fill=fill, width=width)
-        x += h
+    plot_adaptive(canv, func, a, b, scale, center_x, center_y, fill=fill, width=width)
 
 def create_axes(center_x, center_y, scale):
     """
@@ -102,16 +94,29 @@ def create_axes(center_x, center_y, scale):
         canv.create_line(center_x-5, y, center_x+5, y)
         canv.create_text(center_x+15, y, text=str(i))
 
+def draw_background():
+    """
+    Рисует оси и график функции. Слои сцены перерисовываются,
+    только если изменились центр или масштаб.
+    """
+    with canv.layer('axes', (center_x, center_y, scale)) as stale:
+        if stale:
+            create_axes(center_x, center_y, scale)
+    with canv.layer('curve', (center_x, center_y, scale)) as stale:
+        if stale:
+            draw_func(f, -7, 7, scale, center_x, center_y)
+
 def run_method(number):
     """
-    Очищает экран, рисует оси, функцию и прямоугольники выбранного метода.
+    Рисует оси, функцию и прямоугольники выбранного метода.
+    Элементы холста не пересоздаются, а обновляются (см. scene.Scene).
 
     number — тип метода (0 — левых, 1 — правых прямоугольников).
     """
-    canv.delete("all")
-    create_axes(center_x, center_y, scale)
-    draw_func(f, -7, 7, scale, center_x, center_y)
-    draw_met_rect(f, a, b, n, scale, center_x, center_y, number)
+    draw_background()
+    with canv.layer('method', (number, a, b, n, scale, center_x, center_y)) as stale:
+        if stale:
+            draw_met_rect(f, a, b, n, scale, center_x, center_y, number)
     result = method_rectangles(a, b, f, n, number)
     result_label.config(text=f"Приближённое значение интеграла: {result:.5f}")
 
@@ -123,29 +128,30 @@ scale = 150
 center_x = 500
 center_y = 400
 
-mainm = tk.Tk()
-mainm.title('Метод прямоугольников')
-mainm.geometry('1000x900')
-mainm.configure(bg = "gray")
-mainm.resizable(False, False)
+if __name__ == "__main__":
+    mainm = tk.Tk()
+    mainm.title('Метод прямоугольников')
+    mainm.geometry('1000x900')
+    mainm.configure(bg = "gray")
+    mainm.resizable(False, False)
 
-canv = tk.Canvas(mainm, width=1000, height=800, bg='gainsboro')
-canv.pack()
+    # Холст с сохраняемой сценой: оси и график не рисуются заново без нужды
+    canv = Scene(tk.Canvas(mainm, width=1000, height=800, bg='gainsboro'))
+    canv.pack()
 
-# Панель с кнопками
-button_frame = tk.Frame(mainm)
-button_frame.pack()
+    # Панель с кнопками
+    button_frame = tk.Frame(mainm)
+    button_frame.pack()
 
-# Кнопки выбора метода
-tk.Button(button_frame, text="Метод левых прямоугольников", command=lambda: run_method(0)).pack(side=tk.LEFT, padx=10)
-tk.Button(button_frame, text="Метод правых прямоугольников", command=lambda: run_method(1)).pack(side=tk.LEFT, padx=10)
+    # Кнопки выбора метода
+    tk.Button(button_frame, text="Метод левых прямоугольников", command=lambda: run_method(0)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Метод правых прямоугольников", command=lambda: run_method(1)).pack(side=tk.LEFT, padx=10)
 
-# для вывода результата
-result_label = tk.Label(mainm, text="Приближённое значение интеграла:", font=('Arial', 14))
-result_label.pack(pady=10)
+    # для вывода результата
+    result_label = tk.Label(mainm, text="Приближённое значение интеграла:", font=('Arial', 14))
+    result_label.pack(pady=10)
 
-# Первоначальная отрисовка координат и графика функции
-create_axes(center_x, center_y, scale)
-draw_func(f, -7, 7, scale, center_x, center_y)
+    # Первоначальная отрисовка координат и графика функции
+    draw_background()
 
-mainm.mainloop()
+    mainm.mainloop()
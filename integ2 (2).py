@@ -1,13 +1,21 @@
 import tkinter as tk
-import math
+from functools import partial
+import numpy as np
+import quadrature
+from sample_cache import SampleCache
+from curve import adaptive_sample, draw_curve, draw_envelope, plot_adaptive, MIN_SHAPE_WIDTH
+from scene import Scene
+from view import ZoomPan
+from scheduler import RedrawScheduler
+from worker import Worker, integrate
 
 def f(x):
     """
     Функция для интегрирования.
     """
-    return math.tan(x)
+    return np.tan(x)
 
-def method_rectangles(start, finish, function, num, number):
+def method_rectangles(start, finish, function, num, number, trace=None):
     """
     Вычисляет приближённое значение определённого интеграла методом прямоугольников (левым или правым).
 
@@ -16,23 +24,11 @@ def method_rectangles(start, finish, function, num, number):
     function — функция, которую интегрируем  
     num — количество прямоугольников  
     number — тип метода (0 — левых, 1 — правых прямоугольников)  
+    trace — журнал работы метода (solver_trace.Trace), необязательный  
     """
-    s = 0
-    h = (finish - start) / num
-
-    if number == 0:  # метод левых прямоугольников
-        x = start
-        for i in range(num):
-            s += function(x) * h
-            x += h
-    elif number == 1:  # метод правых прямоугольников
-        x = start + h
-        for i in range(num):
-            s += function(x) * h
-            x += h
-    return s
+    return quadrature.rectangles(function, start, finish, num, number, trace=trace)
 
-def method_trapezoid(start, finish, function, num):
+def method_trapezoid(start, finish, function, num, trace=None):
     """
     Вычисляет приближённое значение определённого интеграла методом трапеций.
 
@@ -40,12 +36,9 @@ def method_trapezoid(start, finish, function, num):
     finish — конец интервала  
     function — функция, которую интегрируем  
     num — количество трапеций  
+    trace — журнал работы метода (solver_trace.Trace), необязательный  
     """
-    h = (finish - start) / num
-    s = (function(start) + function(finish)) / 2
-    for i in range(1, num):
-        s += function(start + i * h)
-    return s * h
+    return quadrature.trapezoid(function, start, finish, num, trace=trace)
 
 def draw_met_rect(function, start, finish, num, scale, center_x, center_y, number, fill='red'):
     """
@@ -62,6 +55,14 @@ def draw_met_rect(function, start, finish, num, scale, center_x, center_y, numbe
     fill — цвет обводки  
     """
     h = (finish - start) / num
+    if h * scale < MIN_SHAPE_WIDTH and number in (0, 1):
+        # прямоугольники уже нескольких пикселей: одна огибающая вместо n фигур
+        x = quadrature.grid(start, finish, num)
+        y = quadrature.evaluate(function, x[:-1] if number == 0 else x[1:], fill=np.nan)
+        edges = center_x + x * scale
+        draw_envelope(canv, np.repeat(edges, 2)[1:-1], center_y - np.repeat(y, 2) * scale, center_y,
+                      fill=fill, outline=fill)
+        return
     for i in range(num):
         if number == 0:
             x = start + i * h
@@ -92,6 +93,12 @@ def draw_met_trapezoid(function, start, finish, num, scale, center_x, center_y,
     fill — цвет линий  
     """
     h = (finish - start) / num
+    if h * scale < MIN_SHAPE_WIDTH:
+        # трапеции уже нескольких пикселей: одна огибающая вместо n фигур
+        x = quadrature.grid(start, finish, num)
+        y = quadrature.evaluate(function, x, fill=np.nan)
+        draw_envelope(canv, center_x + x * scale, center_y - y * scale, center_y, fill=fill, outline=fill)
+        return
     for i in range(num):
         x0 = start + i * h
         x1 = x0 + h
@@ -107,9 +114,39 @@ def draw_met_trapezoid(function, start, finish, num, scale, center_x, center_y,
                             x1_screen, y1_screen, x1_screen, center_y,
                             outline=fill, fill='', smooth=False)
 
-def draw_func(func, a, b, scale, center_x, center_y, fill='blue', width=2):
+def draw_gauss_nodes(function, start, finish, num, order, scale, center_x, center_y, fill='red'):
+    """
+    Рисует узлы составного правила Гаусса: отрезки от оси до графика
+    в каждом узле и границы частей.
+
+    function — функция, которую интегрируем  
+    start — начало интервала  
+    finish — конец интервала  
+    num — количество частей  
+    order — число узлов Гаусса на каждой части  
+    scale — масштаб  
+    center_x — центр по оси x  
+    center_y — центр по оси y  
+    fill — цвет узлов  
+    """
+    nodes, _ = quadrature.gauss_legendre_nodes(order)
+    h = (finish - start) / num
+    for i in range(num + 1):
+        x_screen = center_x + (start + i * h) * scale
+        canv.create_line(x_screen, center_y - 5, x_screen, center_y + 5, fill=fill)
+    for i in range(num):
+        middle = start + (i + 0.5) * h
+        for t in nodes:
+            x = middle + h / 2 * t
+            x_screen = center_x + x * scale
+            y_screen = center_y - function(x) * scale
+            canv.create_line(x_screen, center_y, x_screen, y_screen, fill=fill, dash=(2, 2))
+            canv.create_oval(x_screen - 3, y_screen - 3, x_screen + 3, y_screen + 3, outline=fill)
+
+def draw_func(func, a, b, scale, center_x, center_y, fill='blue', width=2, samples=None):
     """
-    Рисует график функции на Canvas.
+    Рисует график функции на Canvas. Точки сгущаются на изгибах,
+    в полюсах линия обрывается (см. curve.adaptive_sample).
 
     func — функция для отрисовки  
     a — начало отрезка  
@@ -119,19 +156,33 @@ def draw_func(func, a, b, scale, center_x, center_y, fill='blue', width=2):
     center_y — центр по оси y  
     fill — цвет линии  
     width — толщина линии  
+    samples — готовые точки (x, y), по умолчанию вычисляются  
+    """
+    if samples is None:
+        plot_adaptive(canv, func, a, b, scale, center_x, center_y, fill=fill, width=width)
+        return
+    x, y = samples  # nan в y — разрыв линии
+    draw_curve(canv, zip(center_x + x * scale, center_y - y * scale), fill=fill, width=width)
+
+def resample():
+    """
+    Пересчитывает точки графика для текущего вида в фоновом потоке,
+    рисует их draw_sampled.
+    """
+    start, finish, step, low, high = target = view.sample_range()
+    sample_worker.submit(lambda job: adaptive_sample(f, start, finish, 1 / step, (low, high))[:2],
+                         on_result=lambda samples: draw_sampled(target, samples))
+
+def draw_sampled(target, samples):
+    """
+    Рисует график по точкам samples, построенным для области target
+    (см. view.ZoomPan.sample_range), в текущем виде.
     """
-    h = 0.01
-    x = a
-    while x < b:
-        try:
-            x0_screen = center_x + x * scale
-            y0_screen = center_y - func(x) * scale
-            x1_screen = center_x + (x + h) * scale
-            y1_screen = center_y - func(x + h) * scale
-            canv.create_line(x0_screen, y0_screen, x1_screen, y1_screen, fill=fill, width=width)
-        except:
-            pass
-        x += h
+    global sampled
+    sampled = target
+    with canv.layer('curve', target) as stale:
+        if stale:
+            draw_func(f, target[0], target[1], view.scale, view.center_x, view.center_y, samples=samples)
 
 def create_axes(center_x, center_y, scale):
     """
@@ -153,26 +204,70 @@ def create_axes(center_x, center_y, scale):
         canv.create_line(center_x-5, y, center_x+5, y)
         canv.create_text(center_x+15, y, text=str(i))
 
+def draw_method(number):
+    """
+    Рисует фигуры выбранного метода (у адаптивного метода и метода
+    Ромберга их нет).
+
+    number — тип метода (см. run_method)  
+    """
+    if number == 0 or number == 1:
+        draw_met_rect(f_cached, a, b, n, scale, center_x, center_y, number)
+    elif number == 2:
+        draw_met_trapezoid(f_cached, a, b, n, scale, center_x, center_y)
+    elif number == 5:
+        draw_gauss_nodes(f_cached, a, b, 1, gauss_order, scale, center_x, center_y)
+    elif number == 6:
+        draw_gauss_nodes(f_cached, a, b, n, composite_order, scale, center_x, center_y)
+
 def redraw():
     """
     Перерисовывает координаты, график функции и выбранный метод.
+    Слой сцены (см. scene.Scene) обновляется, только если изменилось то,
+    от чего он зависит; элементы холста переиспользуются. График
+    пересчитывается, только если его точек на экране стало слишком мало.
     """
-    canv.delete("all")
-    create_axes(center_x, center_y, scale)
-    draw_func(f, -7, 7, scale, center_x, center_y)
-    if current_method == 0 or current_method == 1:
-        draw_met_rect(f, a, b, n, scale, center_x, center_y, current_method)
-        result = method_rectangles(a, b, f, n, current_method)
-    elif current_method == 2:
-        draw_met_trapezoid(f, a, b, n, scale, center_x, center_y)
-        result = method_trapezoid(a, b, f, n)
-    result_label.config(text=f"Приближённое значение интеграла: {result:.5f}")
+    global scale, center_x, center_y
+    scale, center_x, center_y = view.scale, view.center_x, view.center_y
+    with canv.layer('axes', (center_x, center_y, scale)) as stale:
+        if stale:
+            create_axes(center_x, center_y, scale)
+    if not view.covers(sampled):
+        resample()
+    number = current_method
+    with canv.layer('method', (number, a, b, n, scale, center_x, center_y)) as stale:
+        if stale:
+            draw_method(number)
+
+    if number == 0 or number == 1:
+        rule = lambda function, start, finish, num: method_rectangles(start, finish, function, num, number)
+        task = partial(integrate, rule=rule, function=f_cached, start=a, finish=b, num=n)
+    elif number == 2:
+        rule = lambda function, start, finish, num: method_trapezoid(start, finish, function, num)
+        task = partial(integrate, rule=rule, function=f_cached, start=a, finish=b, num=n)
+    elif number == 3:
+        task = lambda job: quadrature.adaptive(f_cached, a, b)[0]
+    elif number == 4:
+        task = lambda job: quadrature.romberg(f_cached, a, b)[0]
+    elif number == 5:
+        task = lambda job: quadrature.gauss_legendre(f_cached, a, b, gauss_order)
+    elif number == 6:
+        task = lambda job: quadrature.composite_gauss(f_cached, a, b, n, composite_order)
+
+    # интеграл считается в фоновом потоке, окно при этом не зависает
+    integral_worker.submit(
+        task,
+        on_result=lambda result: result_label.config(text=f"Приближённое значение интеграла: {result:.5f}"),
+        on_progress=lambda progress: result_label.config(text=f"Вычисление: {progress:.0%}"),
+        on_error=lambda e: result_label.config(text=f"Ошибка вычисления: {e}"))
 
 def run_method(number):
     """
     Запускает расчёт и отрисовку выбранного метода.
 
-    number — тип метода (0 — левые, 1 — правые прямоугольники, 2 — трапеции)  
+    number — тип метода (0 — левые, 1 — правые прямоугольники, 2 — трапеции,
+             3 — адаптивный метод Гаусса–Кронрода, 4 — метод Ромберга,
+             5 — правило Гаусса–Лежандра, 6 — составное правило Гаусса)  
     """
     global current_method
     current_method = number
@@ -180,11 +275,18 @@ def run_method(number):
 
 def on_scale_change(value):
     """
-    Обновляет масштаб и перерисовывает график при изменении значения ползунка.
+    Масштабирует изображение при изменении значения ползунка.
     """
-    global scale
-    scale = float(value)
-    redraw()
+    if abs(float(value) - view.scale) >= 0.5:
+        view.zoom_to(float(value))
+
+def on_view_change(view):
+    """
+    Вызывается, когда масштабирование или перетаскивание закончилось:
+    ползунок показывает новый масштаб, сцена обновляется.
+    """
+    scale_slider.set(round(view.scale))
+    redraw_scheduler.request()
 
 # Параметры интегрирования
 a = 0
@@ -194,37 +296,65 @@ scale = 200
 center_x = 500
 center_y = 400
 current_method = 0
+sampled = None        # область, для которой построен график на холсте (см. resample)
+gauss_order = 20      # узлов в правиле Гаусса–Лежандра
+composite_order = 5   # узлов на каждой из n частей составного правила
+
+# Кэш значений функции, общий для графика и интегрирования:
+# при изменении масштаба функция заново не вычисляется
+samples = SampleCache()
+f_cached = samples.wrap(f)
+
+if __name__ == "__main__":
+    # Окно
+    mainm = tk.Tk()
+    mainm.title('Метод прямоугольников и трапеций')
+    mainm.geometry('1000x900')
+    mainm.resizable(False, False)
+
+    # Перерисовки при движении ползунка объединяются в одну
+    redraw_scheduler = RedrawScheduler(mainm, redraw, delay=20)
+
+    # Фоновые потоки для вычисления интегралов и точек графика
+    integral_worker = Worker(mainm)
+    sample_worker = Worker(mainm)
+
+    # Canvas
+    # Холст с сохраняемой сценой: оси и график не рисуются заново без нужды
+    canv = Scene(tk.Canvas(mainm, width=1000, height=800, bg='white'))
+    canv.add_layers('axes', 'curve', 'method')
+    canv.pack()
+
+    # Колесо мыши — масштаб, перетаскивание — сдвиг
+    view = ZoomPan(canv, scale, center_x, center_y, on_view_change, min_scale=50, max_scale=400)
+
+    # Панель кнопок
+    button_frame = tk.Frame(mainm)
+    button_frame.pack()
+
+    tk.Button(button_frame, text="Метод левых прямоугольников", command=lambda: run_method(0)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Метод правых прямоугольников", command=lambda: run_method(1)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Метод трапеций", command=lambda: run_method(2)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Адаптивный", command=lambda: run_method(3)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Ромберг", command=lambda: run_method(4)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Гаусс–Лежандр", command=lambda: run_method(5)).pack(side=tk.LEFT, padx=10)
+    tk.Button(button_frame, text="Составной Гаусс", command=lambda: run_method(6)).pack(side=tk.LEFT, padx=10)
+
+    # Ползунок масштаба
+    scale_slider = tk.Scale(mainm, from_=50, to=400, orient=tk.HORIZONTAL, label="Масштаб (пикселей на единицу)",
+                            command=on_scale_change)
+    scale_slider.set(scale)
+    scale_slider.pack(pady=10)
+
+    # Метка результата
+    result_label = tk.Label(mainm, text="Приближённое значение интеграла:", font=('Arial', 14))
+    result_label.pack(pady=10)
+
+    # Первая отрисовка
+    redraw()
 
-# Окно
-mainm = tk.Tk()
-mainm.title('Метод прямоугольников и трапеций')
-mainm.geometry('1000x900')
-mainm.resizable(False, False)
-
-# Canvas
-canv = tk.Canvas(mainm, width=1000, height=800, bg='white')
-canv.pack()
-
-# Панель кнопок
-button_frame = tk.Frame(mainm)
-button_frame.pack()
-
-tk.Button(button_frame, text="Метод левых прямоугольников", command=lambda: run_method(0)).pack(side=tk.LEFT, padx=10)
-tk.Button(button_frame, text="Метод правых прямоугольников", command=lambda: run_method(1)).pack(side=tk.LEFT, padx=10)
-tk.Button(button_frame, text="Метод трапеций", command=lambda: run_method(2)).pack(side=tk.LEFT, padx=10)
-
-# Ползунок масштаба
-scale_slider = tk.Scale(mainm, from_=50, to=400, orient=tk.HORIZONTAL, label="Масштаб (пикселей на единицу)",
-                        command=on_scale_change)
-scale_slider.set(scale)
-scale_slider.pack(pady=10)
-
-# Метка результата
-result_label = tk.Label(mainm, text="Приближённое значение интеграла:", font=('Arial', 14))
-result_label.pack(pady=10)
-
-# Первая отрисовка
-redraw()
-
-# Запуск
-mainm.mainloop()
+    # Запуск
+    mainm.mainloop()
+    integral_worker.shutdown()
+    sample_worker.shutdown()
+    print(f"Перерисовок: {redraw_scheduler.runs}, пропущено: {redraw_scheduler.skipped}")
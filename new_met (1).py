@@ -1,4 +1,6 @@
 import tkinter as tk
+from curve import plot_adaptive
+import roots
 
 def init_window(width: int, height: int):
     """
@@ -36,27 +38,12 @@ def func(x):
     """
     return x ** 2 - 2
 
-def func_derivative(x):
-    """
-    Производная функции: f'(x) = 2x
-    """
-    return 2 * x
-
-def plot_function(canvas, width: int, height: int, scale: float, step=0.05):
+def plot_function(canvas, width: int, height: int, scale: float, tolerance=0.5):
     """
     Рисует график функции f(x).
     """
     center_x, center_y = width // 2, height // 2
-    x = -10
-    while x <= 10:
-        x1, y1 = x, func(x)
-        x2, y2 = x + step, func(x + step)
-        canvas.create_line(
-            center_x + x1 * scale, center_y - y1 * scale,
-            center_x + x2 * scale, center_y - y2 * scale,
-            fill="cyan", width=2
-        )
-        x += step
+    plot_adaptive(canvas, func, -10, 10, scale, center_x, center_y, tolerance, fill="cyan", width=2)
 
 def draw_tangent(canvas, width: int, height: int, x0: float, y0: float, slope: float, scale: float):
     """
@@ -89,18 +76,17 @@ def mark_root(canvas, width: int, height: int, x_root: float, scale: float):
     canvas.create_text(center_x + x_root * scale + 10, center_y - y_root * scale - 10,
                        text=f"{x_root:.4f}", fill="red", font=("Arial", 10, "bold"))
 
-def newton_visualization(canvas, width: int, height: int, start_x: float, scale: float, tolerance=1e-4, iterations=10):
+def newton_visualization(canvas, width: int, height: int, start_x: float, scale: float, tolerance=1e-4, iterations=10,
+                         trace=None):
     """
     Метод Ньютона с визуализацией процесса нахождения корня.
+    trace — журнал работы метода (solver_trace.Trace), необязательный.
     """
-    x = start_x
-    for _ in range(iterations):
-        y = func(x)
-        dy = func_derivative(x)
-        if abs(y) < tolerance:
-            break
-        draw_tangent(canvas, width, height, x, y, dy, scale)
-        x = x - y / dy
+    x = roots.newton(
+        func, None, start_x, tolerance, iterations,  # производная считается автоматически
+        on_step=lambda x, y, dy: draw_tangent(canvas, width, height, x, y, dy, scale),
+        trace=trace
+    )
     mark_root(canvas, width, height, x, scale)
 
 if __name__ == "__main__":
@@ -112,4 +98,10 @@ if __name__ == "__main__":
     plot_function(canvas, width, height, scale)
     newton_visualization(canvas, width, height, start_x=1.5, scale=scale)
 
+    # Все корни на отображаемом отрезке [-10, 10], а не только ближайший к начальному приближению
+    all_roots, evaluations = roots.find_all(func, -10, 10)
+    for x_root in all_roots:
+        mark_root(canvas, width, height, x_root, scale)
+    print(f"Корни: {', '.join(f'{x_root:.6f}' for x_root in all_roots)} ({evaluations} вычислений функции)")
+
     window.mainloop()
@@ -0,0 +1,131 @@
+"""
+Составные правила (прямоугольники, трапеции, Симпсон) в нескольких процессах.
+
+Нужно, когда функция — медленный код на Python, который нельзя
+векторизовать: тогда NumPy не помогает и всё время уходит на вызовы
+функции в одном ядре. Сетка делится на части по chunk узлов, части
+считаются в ProcessPoolExecutor, а результаты собираются в порядке
+частей, а не в порядке готовности, поэтому ответ не зависит от числа
+процессов и от того, какой из них закончил первым.
+
+Для метода Симпсона chunk чётное: каждая часть начинается с узла
+чётного номера, и пары отрезков параболы не разрываются.
+
+В детерминированном режиме (по умолчанию) ответ совпадает с обычным
+quadrature.rectangles / trapezoid / simpson до последнего бита:
+процессы только вычисляют значения функции, а суммируются они тем же
+кодом, что и в последовательной версии. Без него каждая часть сразу
+сворачивается в частичную сумму, которые складываются с компенсацией
+(quadrature.compensated_sum) — меньше передачи данных между процессами,
+но результат может отличаться от последовательного в последних битах.
+
+Функция должна передаваться в другой процесс (pickle): функция уровня
+модуля или формула из expression.compile_expression, но не lambda
+и не обёртка SampleCache.wrap.
+
+Модуль — только программный интерфейс (для своих скриптов): графические
+программы его не используют, потому что интегрируют обёртку
+SampleCache.wrap, а её в другой процесс не передать.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import quadrature
+from solver_trace import NO_TRACE
+
+# Узлов в одной части по умолчанию: достаточно, чтобы пересылка
+# части между процессами была дешевле её вычисления.
+DEFAULT_CHUNK = 1 << 12
+
+_pool = None
+_pool_workers = None
+_pool_lock = threading.Lock()
+
+
+def get_pool(workers=None):
+    """
+    Возвращает общий пул из workers процессов (по умолчанию — по числу
+    ядер). Пул создаётся при первом вызове и переиспользуется, пока
+    не понадобится другое число процессов.
+    """
+    global _pool, _pool_workers
+    workers = workers or os.cpu_count() or 1
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(workers)
+            _pool_workers = workers
+        return _pool
+
+
+def shutdown():
+    """
+    Останавливает общий пул процессов (например, при закрытии программы).
+    """
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = _pool_workers = None
+
+
+def _values(function, start, h, lo, hi, fill):
+    """
+    Значения функции в узлах с номерами lo..hi-1 (выполняется в процессе пула).
+    """
+    return quadrature.evaluate(function, start + np.arange(lo, hi) * h, fill)
+
+
+def integrate(function, start, finish, num, rule, workers=None, chunk=DEFAULT_CHUNK,
+              deterministic=True, fill=None, trace=None):
+    """
+    Составное правило rule ('left', 'right', 'trapezoid', 'simpson')
+    на num отрезках, вычисленное в workers процессах.
+
+    chunk — число узлов в одной части (для Симпсона округляется до чётного),
+    deterministic — результат бит в бит как у последовательного правила,
+    workers=1 — всё считается в текущем процессе, без пула.
+    """
+    log = trace or NO_TRACE
+    log.start('parallel_' + rule)
+    if rule == 'simpson' and num % 2 != 0:
+        num += 1
+    h = (finish - start) / num
+    first, last = quadrature.node_range(rule, num)
+    # то же условие, что в последовательных правилах: при num > CHUNK
+    # сетка суммируется частями по CHUNK узлов (quadrature.stream)
+    streamed = num > quadrature.CHUNK
+    if deterministic and streamed:
+        chunk = quadrature.CHUNK
+    chunk = max(2, chunk - chunk % 2) if rule == 'simpson' else max(1, chunk)
+    los = list(range(first, last + 1, chunk))
+    his = [min(lo + chunk, last + 1) for lo in los]
+    n = len(los)
+
+    if deterministic and not streamed:
+        parts = _map(workers, _values, [function] * n, [start] * n, [h] * n, los, his, [fill] * n)
+        result = quadrature.combine(rule, np.concatenate(list(parts)), h)
+    else:
+        parts = _map(workers, quadrature.partial_sum, [function] * n, [start] * n, [h] * n,
+                     los, his, [num] * n, [rule] * n, [fill] * n)
+        result = quadrature.compensated_sum(parts) * (h / 3 if rule == 'simpson' else h)
+
+    if trace is not None:
+        # функция вычислялась в других процессах, trace.counted их не видит
+        trace.evaluations += last - first + 1
+    log.record(result)
+    log.finish('completed')
+    return result
+
+
+def _map(workers, task, *arguments):
+    """
+    Выполняет task по частям; результаты — в порядке частей.
+    """
+    if workers == 1:
+        return map(task, *arguments)
+    return get_pool(workers).map(task, *arguments)
@@ -0,0 +1,409 @@
+import math
+import os
+import threading
+
+import numpy as np
+
+from solver_trace import NO_TRACE
+
+
+def evaluate(function, x, fill=None):
+    """
+    Вычисляет значения функции на массиве точек.
+
+    Сначала функция вызывается один раз на всём массиве (подходит для
+    функций на ufunc NumPy, например np.tan). Если функция не умеет
+    работать с массивами, значения считаются поэлементно.
+
+    function — функция одной переменной,
+    x — массив точек,
+    fill — значение для точек, в которых функция выбросила исключение
+           (None — исключение пробрасывается дальше).
+    """
+    x = np.asarray(x, dtype=float)
+    try:
+        with np.errstate(all='ignore'):
+            y = np.asarray(function(x), dtype=float)
+        if y.shape == x.shape:
+            return y
+    except Exception:
+        pass
+
+    y = np.empty(x.shape)
+    for i, t in enumerate(x.flat):
+        try:
+            y.flat[i] = function(float(t))
+        except Exception:
+            if fill is None:
+                raise
+            y.flat[i] = fill
+    return y
+
+
+def grid(start, finish, num):
+    """
+    Возвращает равномерную сетку из num + 1 узлов на [start, finish].
+    Узлы считаются от целых индексов, поэтому ошибка округления
+    не накапливается, как при x += h.
+    """
+    h = (finish - start) / num
+    return start + np.arange(num + 1) * h
+
+
+# Наибольшее число узлов, которое обрабатывается одним массивом.
+# При большем n сетка строится и суммируется по частям (см. stream).
+CHUNK = 1 << 20
+
+
+def stream(function, start, finish, num, rule, chunk=CHUNK, fill=None):
+    """
+    Вычисляет интеграл составным правилом, не создавая всю сетку сразу.
+
+    Узлы строятся частями по chunk штук от целых индексов, сумма каждой
+    части считается NumPy (попарное суммирование), а частичные суммы
+    складываются с компенсацией Ноймайера. Память не зависит от n,
+    а ошибка округления почти не растёт даже при миллиардах узлов.
+
+    rule — 'left', 'right', 'trapezoid' или 'simpson'
+    (для метода Симпсона num должно быть чётным).
+    """
+    h = (finish - start) / num
+    first, last = node_range(rule, num)
+    partials = (partial_sum(function, start, h, lo, min(lo + chunk, last + 1), num, rule, fill)
+                for lo in range(first, last + 1, chunk))
+    return compensated_sum(partials) * (h / 3 if rule == 'simpson' else h)
+
+
+def node_range(rule, num):
+    """
+    Номера первого и последнего узла сетки, в которых правило rule
+    вычисляет функцию (для прямоугольников — без одного из концов).
+    """
+    return (1, num) if rule == 'right' else (0, num - 1 if rule == 'left' else num)
+
+
+def partial_sum(function, start, h, lo, hi, num, rule, fill=None):
+    """
+    Взвешенная сумма значений функции в узлах с номерами lo..hi-1
+    (без множителя h или h/3). Вес узла зависит только от его номера,
+    поэтому части можно считать независимо и в любом порядке.
+    """
+    index = np.arange(lo, hi)
+    y = evaluate(function, start + index * h, fill)
+    if rule == 'simpson':
+        weights = np.where(index % 2 == 1, 4.0, 2.0)
+    else:
+        weights = np.ones(index.size)
+    if rule in ('trapezoid', 'simpson'):
+        weights[(index == 0) | (index == num)] = 1.0 if rule == 'simpson' else 0.5
+    # np.sum суммирует попарно (np.dot идёт через BLAS, там порядок не гарантирован)
+    return float(np.sum(weights * y))
+
+
+def compensated_sum(values):
+    """
+    Сумма чисел по порядку с компенсацией ошибки округления
+    (алгоритм Ноймайера).
+    """
+    total = compensation = 0.0
+    for value in values:
+        t = total + value
+        if abs(total) >= abs(value):
+            compensation += (total - t) + value
+        else:
+            compensation += (value - t) + total
+        total = t
+    return total + compensation
+
+
+def combine(rule, y, h):
+    """
+    Значение составного правила rule по значениям y во всех его узлах
+    (см. node_range) при шаге h.
+    """
+    if rule in ('left', 'right'):
+        return float(np.sum(y) * h)
+    if rule == 'trapezoid':
+        return float((np.sum(y[1:-1]) + (y[0] + y[-1]) / 2) * h)
+    total = y[0] + y[-1] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-1:2])
+    return float(h / 3 * total)
+
+
+def rectangles(function, start, finish, num, number, fill=None, trace=None):
+    """
+    Метод левых (number = 0) или правых (number = 1) прямоугольников.
+
+    function — функция, которую интегрируем,
+    start, finish — границы интервала,
+    num — количество прямоугольников,
+    fill — см. evaluate,
+    trace — журнал работы (solver_trace.Trace), по умолчанию не ведётся.
+    """
+    trace = trace or NO_TRACE
+    trace.start('rectangles')
+    if number not in (0, 1):
+        trace.finish('invalid_number')
+        return 0
+    if num > CHUNK:
+        return _done(trace, stream(trace.counted(function), start, finish, num, ('left', 'right')[number], fill=fill))
+    h = (finish - start) / num
+    x = grid(start, finish, num)
+    x = x[:-1] if number == 0 else x[1:]
+    return _done(trace, combine('left', evaluate(trace.counted(function), x, fill), h))
+
+
+def trapezoid(function, start, finish, num, fill=None, trace=None):
+    """
+    Метод трапеций на num отрезках.
+    """
+    trace = trace or NO_TRACE
+    trace.start('trapezoid')
+    if num > CHUNK:
+        return _done(trace, stream(trace.counted(function), start, finish, num, 'trapezoid', fill=fill))
+    h = (finish - start) / num
+    y = evaluate(trace.counted(function), grid(start, finish, num), fill)
+    return _done(trace, combine('trapezoid', y, h))
+
+
+def simpson(function, start, finish, num, fill=None, trace=None):
+    """
+    Метод Симпсона на num отрезках (нечётное num увеличивается на 1).
+    """
+    trace = trace or NO_TRACE
+    trace.start('simpson')
+    if num % 2 != 0:
+        num += 1
+    if num > CHUNK:
+        return _done(trace, stream(trace.counted(function), start, finish, num, 'simpson', fill=fill))
+    h = (finish - start) / num
+    y = evaluate(trace.counted(function), grid(start, finish, num), fill)
+    return _done(trace, combine('simpson', y, h))
+
+
+def _done(trace, result):
+    """
+    Записывает в журнал результат правила с фиксированной сеткой.
+    """
+    trace.record(result)
+    trace.finish('completed')
+    return result
+
+
+# Узлы и веса правила Гаусса–Кронрода (7 точек Гаусса, 15 точек Кронрода)
+_KRONROD_NODES = np.array([
+    0.991455371120812639206854697526329, 0.949107912342758524526189684047851,
+    0.864864423359769072789712788640926, 0.741531185599394439863864773280788,
+    0.586087235467691130294144845693013, 0.405845151377397166906606412076961,
+    0.207784955007898467600689403773245, 0.0,
+])
+_KRONROD_WEIGHTS = np.array([
+    0.022935322010529224963732008058970, 0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518, 0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550, 0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649, 0.209482141084727828012999174891714,
+])
+_GAUSS_WEIGHTS = np.array([
+    0.129484966168869693270611432679082, 0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975, 0.417959183673469387755102040816327,
+])
+GK_NODES = np.concatenate((-_KRONROD_NODES[:-1], _KRONROD_NODES[::-1]))
+GK_WEIGHTS = np.concatenate((_KRONROD_WEIGHTS[:-1], _KRONROD_WEIGHTS[::-1]))
+# вклад узлов Гаусса (каждый второй узел Кронрода) для оценки погрешности
+GAUSS_WEIGHTS = np.zeros(15)
+GAUSS_WEIGHTS[1::2] = np.concatenate((_GAUSS_WEIGHTS[:-1], _GAUSS_WEIGHTS[::-1]))
+
+
+def _kronrod(function, start, finish):
+    """
+    Правило Гаусса–Кронрода на одном отрезке.
+    Возвращает (значение, оценка погрешности).
+    """
+    half = (finish - start) / 2
+    y = evaluate(function, (start + finish) / 2 + half * GK_NODES)
+    value = half * np.dot(GK_WEIGHTS, y)
+    error = abs(value - half * np.dot(GAUSS_WEIGHTS, y))
+    if not np.isfinite(error):
+        error = np.inf
+    return float(value), float(error)
+
+
+def adaptive(function, start, finish, tol=1e-10, limit=1000, trace=None):
+    """
+    Адаптивное интегрирование правилом Гаусса–Кронрода 7–15.
+
+    Отрезок с наибольшей оценкой погрешности делится пополам, пока
+    суммарная погрешность не станет меньше tol или число отрезков
+    не достигнет limit. Так вычисления сгущаются только там, где
+    функция быстро меняется.
+
+    Возвращает (значение, оценка погрешности, число вычислений функции).
+    """
+    trace = trace or NO_TRACE
+    trace.start('adaptive')
+    function = trace.counted(function)
+    value, error = _kronrod(function, start, finish)
+    intervals = [(start, finish, value, error)]
+    evaluations = 15
+
+    while sum(e for _, _, _, e in intervals) > tol and len(intervals) < limit:
+        worst = max(range(len(intervals)), key=lambda i: intervals[i][3])
+        left, right, _, _ = intervals.pop(worst)
+        middle = (left + right) / 2
+        for a, b in ((left, middle), (middle, right)):
+            intervals.append((a, b) + _kronrod(function, a, b))
+        evaluations += 30
+        if trace is not NO_TRACE:
+            trace.record(sum(v for _, _, v, _ in intervals), sum(e for _, _, _, e in intervals))
+
+    value = sum(v for _, _, v, _ in intervals)
+    error = sum(e for _, _, _, e in intervals)
+    trace.finish('converged' if error <= tol else 'limit')
+    return value, error, evaluations
+
+
+def romberg(function, start, finish, tol=1e-10, max_levels=20, min_levels=4, trace=None):
+    """
+    Метод Ромберга.
+
+    На каждом уровне число отрезков метода трапеций удваивается, а функция
+    вычисляется только в новых серединах: старые узлы уже учтены в
+    предыдущей сумме. Затем экстраполяция Ричардсона повышает порядок.
+    Итерации прекращаются, когда диагональ таблицы меняется меньше tol,
+    но не раньше уровня min_levels: на грубых сетках узлы могут попасть
+    в нули периодической функции (sin(4x)**2 на [0, pi]), и два первых
+    приближения совпадут случайно.
+
+    Возвращает (значение, таблица Ромберга, число вычислений функции).
+    Строка k таблицы — результаты экстраполяции для 2**k отрезков.
+    """
+    trace = trace or NO_TRACE
+    trace.start('romberg')
+    function = trace.counted(function)
+    h = finish - start
+    ends = evaluate(function, np.array([start, finish], dtype=float))
+    table = [[float(h * (ends[0] + ends[1]) / 2)]]
+    evaluations = 2
+
+    for k in range(1, max_levels + 1):
+        count = 2 ** (k - 1)
+        h /= 2
+        midpoints = start + (2 * np.arange(count) + 1) * h
+        trapezoid = table[-1][0] / 2 + h * float(np.sum(evaluate(function, midpoints)))
+        evaluations += count
+
+        row = [trapezoid]
+        for j in range(1, k + 1):
+            factor = 4 ** j
+            row.append(row[j - 1] + (row[j - 1] - table[-1][j - 1]) / (factor - 1))
+        table.append(row)
+        trace.record(row[-1], abs(row[-1] - table[-2][-1]))
+
+        if k >= min_levels and abs(row[-1] - table[-2][-1]) < tol:
+            trace.finish('converged')
+            break
+    else:
+        trace.finish('max_levels')
+
+    return table[-1][-1], table, evaluations
+
+
+# --- Квадратуры Гаусса–Лежандра ---
+
+# Файл с уже вычисленными узлами и весами: при следующем запуске
+# они читаются с диска, а не считаются заново.
+GAUSS_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__', 'gauss_legendre.npz')
+
+_gauss_table = None
+_gauss_lock = threading.Lock()
+
+
+def gauss_legendre_nodes(order):
+    """
+    Узлы и веса правила Гаусса–Лежандра с order узлами на [-1, 1].
+
+    Для каждого order они вычисляются один раз (np.polynomial.legendre.leggauss),
+    хранятся в памяти и сохраняются в GAUSS_CACHE_FILE. Если файл
+    записать нельзя, таблица просто остаётся только в памяти; если его
+    нельзя прочитать (обрезан, испорчен) или запись в нём не похожа
+    на правило нужного порядка, она вычисляется заново и файл перезаписывается.
+
+    Возвращает (узлы, веса) — массивы только для чтения.
+    """
+    global _gauss_table
+    with _gauss_lock:
+        if _gauss_table is None:
+            _gauss_table = {}
+            try:
+                with np.load(GAUSS_CACHE_FILE) as data:
+                    for key in data.files:
+                        _gauss_table[int(key)] = data[key]
+            except Exception:
+                # любой сбой чтения (в том числе zipfile.BadZipFile) — просто промах кэша
+                _gauss_table = {}
+        table = _gauss_table.get(order)
+        if not _valid_gauss_table(table, order):
+            table = np.array(np.polynomial.legendre.leggauss(order))
+            _gauss_table[order] = table
+            _save_gauss_table()
+    table.flags.writeable = False
+    return table[0], table[1]
+
+
+def _valid_gauss_table(table, order):
+    """
+    Похожа ли запись кэша на правило с order узлами: форма (2, order),
+    конечные значения, сумма весов равна длине [-1, 1].
+    """
+    return (isinstance(table, np.ndarray) and table.shape == (2, order)
+            and table.dtype.kind == 'f' and bool(np.all(np.isfinite(table)))
+            and abs(float(np.sum(table[1])) - 2.0) < 1e-10)
+
+
+def _save_gauss_table():
+    """
+    Записывает таблицу узлов на диск (через временный файл, чтобы
+    прерванная запись не испортила кэш).
+    """
+    try:
+        os.makedirs(os.path.dirname(GAUSS_CACHE_FILE), exist_ok=True)
+        temporary = f"{GAUSS_CACHE_FILE}.{os.getpid()}.tmp.npz"
+        np.savez(temporary, **{str(order): table for order, table in _gauss_table.items()})
+        os.replace(temporary, GAUSS_CACHE_FILE)
+    except OSError:
+        pass
+
+
+def gauss_legendre(function, start, finish, order=20, fill=None, trace=None):
+    """
+    Правило Гаусса–Лежандра с order узлами на всём отрезке.
+    Точно для многочленов степени до 2·order - 1, поэтому на гладких
+    функциях даёт высокую точность за очень малое число вычислений.
+    """
+    trace = trace or NO_TRACE
+    trace.start('gauss_legendre')
+    nodes, weights = gauss_legendre_nodes(order)
+    half = (finish - start) / 2
+    y = evaluate(trace.counted(function), (start + finish) / 2 + half * nodes, fill)
+    return _done(trace, float(half * np.dot(weights, y)))
+
+
+def composite_gauss(function, start, finish, num, order=5, fill=None, trace=None):
+    """
+    Составное правило Гаусса: отрезок делится на num частей, на каждой
+    применяется правило Гаусса–Лежандра с order узлами. Все узлы
+    вычисляются одним массивом (при большом числе — частями по CHUNK).
+    """
+    trace = trace or NO_TRACE
+    trace.start('composite_gauss')
+    function = trace.counted(function)
+    nodes, weights = gauss_legendre_nodes(order)
+    h = (finish - start) / num
+    block = max(1, CHUNK // order)
+
+    partials = []
+    for lo in range(0, num, block):
+        # середины частей считаются от целых индексов, как в grid
+        middles = start + (np.arange(lo, min(lo + block, num)) + 0.5) * h
+        y = evaluate(function, middles[:, None] + (h / 2) * nodes, fill)
+        partials.append(float(np.sum(y @ weights)))
+    return _done(trace, math.fsum(partials) * h / 2)
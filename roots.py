@@ -0,0 +1,552 @@
+import math
+import sys
+
+import numpy as np
+
+from autodiff import value_and_derivative
+from quadrature import evaluate
+from solver_trace import NO_TRACE
+
+
+def bisection(func, a, b, precision=0.001, trace=None):
+    """
+    Метод бисекции (деления отрезка пополам).
+
+    func — функция, корень которой ищется,
+    a, b — границы отрезка, на концах которого функция имеет разные знаки,
+    precision — точность по x,
+    trace — журнал работы (solver_trace.Trace), по умолчанию не ведётся.
+    Возвращает приближённое значение корня.
+    """
+    trace = trace or NO_TRACE
+    trace.start('bisection')
+    func = trace.counted(func)
+    while abs(b - a) > precision:
+        mid = (a + b) / 2
+        if func(mid) == 0:
+            trace.record(mid, 0.0)
+            trace.finish('exact')
+            return mid
+        elif func(mid) * func(a) < 0:
+            b = mid
+        else:
+            a = mid
+        trace.record((a + b) / 2, abs(b - a))
+    trace.finish('converged')
+    return (a + b) / 2
+
+
+def brent(func, a, b, precision=1e-12, max_iter=100, trace=None):
+    """
+    Метод Брента: сочетание бисекции, секущих и обратной квадратичной
+    интерполяции. Корень всегда остаётся внутри отрезка со сменой знака,
+    а на гладких функциях сходимость сверхлинейная. Функция вычисляется
+    в каждой точке ровно один раз. Если интерполяция три шага подряд
+    не уменьшает отрезок со сменой знака вдвое (как у кратного корня
+    (x - 1)³), делается шаг бисекции. Если за max_iter итераций точность
+    не достигнута, оставшийся отрезок со сменой знака делится пополам
+    до точности precision, так что она достигается всегда.
+
+    func — функция, корень которой ищется,
+    a, b — границы отрезка, на концах которого функция имеет разные знаки,
+    precision — точность по x,
+    max_iter — наибольшее число итераций с интерполяцией,
+    trace — журнал работы (solver_trace.Trace).
+    Возвращает (корень, число итераций, число вычислений функции).
+    """
+    trace = trace or NO_TRACE
+    trace.start('brent')
+    func = trace.counted(func)
+    fa, fb = func(a), func(b)
+    evaluations = 2
+    if fa * fb > 0:
+        raise ValueError("функция должна иметь разные знаки на концах отрезка")
+
+    c, fc = b, fb
+    d = e = b - a
+    width, slow = abs(b - a), 0    # длина отрезка при последнем уменьшении вдвое
+    for iteration in range(max_iter):
+        if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+            c, fc = a, fa  # c — конец отрезка со сменой знака
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        if abs(c - b) <= width / 2:
+            width, slow = abs(c - b), 0
+        else:
+            slow += 1
+
+        tol = 2 * sys.float_info.epsilon * abs(b) + precision / 2
+        half = (c - b) / 2
+        if abs(half) <= tol or fb == 0:
+            trace.finish('converged')
+            return b, iteration, evaluations
+
+        if slow >= 3:  # интерполяция сходится медленно — шаг бисекции
+            d = e = half
+        elif abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:  # метод секущих
+                p = 2 * half * s
+                q = 1 - s
+            else:  # обратная квадратичная интерполяция
+                q = fa / fc
+                r = fb / fc
+                p = s * (2 * half * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * half * q - abs(tol * q), abs(e * q)):
+                e, d = d, p / q
+            else:  # интерполяция неудачна — шаг бисекции
+                d = e = half
+        else:
+            d = e = half
+
+        a, fa = b, fb
+        b += d if abs(d) > tol else math.copysign(tol, half)
+        fb = func(b)
+        evaluations += 1
+        trace.record(b, abs(fb))
+
+    if (fb > 0 and fc > 0) or (fb < 0 and fc < 0):
+        c, fc = a, fa
+    iteration = max_iter
+    while abs(c - b) / 2 > 2 * sys.float_info.epsilon * abs(b) + precision / 2 and fb != 0:
+        m = b + (c - b) / 2
+        if m == b or m == c:  # соседние числа с плавающей точкой
+            break
+        fm = func(m)
+        evaluations += 1
+        iteration += 1
+        trace.record(m, abs(fm))
+        if (fm > 0) != (fb > 0):
+            c, fc = b, fb
+        b, fb = m, fm
+    trace.finish('converged')
+    return b, iteration, evaluations
+
+
+def newton(func, derivative, x, tol=1e-4, max_iter=10, on_step=None, trace=None, method='dual'):
+    """
+    Метод Ньютона (касательных).
+
+    func — функция, derivative — её производная
+           (None — производная вычисляется автоматически вместе со значением
+           функции, за одно вычисление),
+    method — способ автоматического дифференцирования: 'dual' (дуальные
+             числа) или 'complex' (комплексный шаг), см. autodiff.value_and_derivative,
+    x — начальное приближение,
+    tol — итерации прекращаются, когда |func(x)| < tol,
+    max_iter — наибольшее число итераций,
+    on_step(x, y, dy) — вызывается на каждом шаге (например, для отрисовки),
+    trace — журнал работы (solver_trace.Trace).
+    Возвращает приближённое значение корня.
+    """
+    trace = trace or NO_TRACE
+    trace.start('newton')
+    func = trace.counted(func)
+    if derivative is not None:
+        derivative = trace.counted(derivative)
+    for _ in range(max_iter):
+        if derivative is None:
+            y, dy = value_and_derivative(func, x, method)
+        else:
+            y = func(x)
+            dy = derivative(x)
+        if abs(y) < tol:
+            trace.finish('converged')
+            break
+        if on_step is not None:
+            on_step(x, y, dy)
+        x = x - y / dy
+        trace.record(x, abs(y))
+    else:
+        trace.finish('max_iter')
+    return x
+
+
+def secant(func, x0, x1, tol=1e-4, max_iter=20, on_step=None, trace=None):
+    """
+    Метод секущих.
+
+    func — функция,
+    x0, x1 — два начальных приближения,
+    tol — итерации прекращаются, когда шаг меньше tol,
+    max_iter — наибольшее число итераций,
+    on_step(x0, y0, x1, y1) — вызывается на каждом шаге,
+    trace — журнал работы (solver_trace.Trace).
+    Возвращает приближённое значение корня.
+    """
+    trace = trace or NO_TRACE
+    trace.start('secant')
+    func = trace.counted(func)
+    for _ in range(max_iter):
+        y0 = func(x0)
+        y1 = func(x1)
+
+        if abs(y1 - y0) < 1e-12:
+            trace.finish('stalled')
+            return x1
+
+        if on_step is not None:
+            on_step(x0, y0, x1, y1)
+
+        x2 = x1 - y1 * (x1 - x0) / (y1 - y0)
+        trace.record(x2, abs(x2 - x1))
+
+        if abs(x2 - x1) < tol:
+            trace.finish('converged')
+            return x2
+
+        x0, x1 = x1, x2
+    trace.finish('max_iter')
+    return x1
+
+
+def simple_iteration(g, x0, tol=1e-4, max_iter=20, on_step=None, trace=None):
+    """
+    Метод простой итерации x = g(x).
+
+    g — итерационная функция,
+    x0 — начальное приближение,
+    tol — итерации прекращаются, когда |g(x) - x| < tol,
+    max_iter — наибольшее число итераций,
+    on_step(x0, x1) — вызывается на каждом шаге,
+    trace — журнал работы (solver_trace.Trace).
+    Возвращает приближённое значение неподвижной точки.
+    """
+    return fixed_point(g, x0, tol, max_iter, on_step=on_step, trace=trace)[0]
+
+
+def fixed_point(g, x0, tol=1e-4, max_iter=20, mode='plain', depth=3, on_step=None, trace=None):
+    """
+    Поиск неподвижной точки x = g(x) с ускорением сходимости.
+
+    mode — способ итерации:
+        'plain'      — простая итерация x = g(x),
+        'aitken'     — Δ²-процесс Эйткена над последовательностью простой итерации,
+        'steffensen' — метод Стеффенсена (Эйткен с перезапуском, сходится квадратично),
+        'anderson'   — смешивание Андерсона по depth последним итерациям
+                       (работает и для векторных x),
+    tol — итерации прекращаются, когда шаг меньше tol,
+    max_iter — наибольшее число итераций,
+    on_step(x0, x1) — вызывается на каждой итерации (переход от x0 к x1),
+    trace — журнал работы (solver_trace.Trace).
+    Возвращает (неподвижная точка, число итераций, число вычислений g).
+    """
+    if trace is None:
+        return _fixed_point(g, x0, tol, max_iter, mode, depth, on_step)
+
+    def step(x_old, x_new):
+        trace.record(x_new, _distance(x_new, x_old))
+        if on_step is not None:
+            on_step(x_old, x_new)
+
+    trace.start(mode)
+    result = _fixed_point(trace.counted(g), x0, tol, max_iter, mode, depth, step)
+    trace.finish('converged' if trace.residuals and trace.residuals[-1] < tol else 'max_iter')
+    return result
+
+
+def _fixed_point(g, x0, tol, max_iter, mode, depth, on_step):
+    if mode == 'plain':
+        for k in range(1, max_iter + 1):
+            x1 = g(x0)
+            if on_step is not None:
+                on_step(x0, x1)
+            if _distance(x1, x0) < tol:
+                return x1, k, k
+            x0 = x1
+        return x0, max_iter, max_iter
+
+    if mode == 'aitken':
+        x1 = g(x0)
+        x2 = g(x1)
+        x = x0
+        for k in range(1, max_iter + 1):
+            x_new = _aitken(x0, x1, x2)
+            if on_step is not None:
+                on_step(x, x_new)
+            if _distance(x_new, x) < tol:
+                return x_new, k, k + 1
+            x = x_new
+            x0, x1, x2 = x1, x2, g(x2)
+        return x, max_iter, max_iter + 2
+
+    if mode == 'steffensen':
+        x = x0
+        for k in range(1, max_iter + 1):
+            x1 = g(x)
+            x_new = _aitken(x, x1, g(x1))
+            if on_step is not None:
+                on_step(x, x_new)
+            if _distance(x_new, x) < tol:
+                return x_new, k, 2 * k
+            x = x_new
+        return x, max_iter, 2 * max_iter
+
+    if mode == 'anderson':
+        scalar = np.ndim(x0) == 0
+        x = np.atleast_1d(np.asarray(x0, dtype=float))
+        xs, fs = [], []
+        for k in range(1, max_iter + 1):
+            gx = np.atleast_1d(np.asarray(g(x[0] if scalar else x), dtype=float))
+            f = gx - x
+            if np.max(np.abs(f)) < tol:
+                x_new = gx
+            elif xs:
+                dx = np.diff(np.column_stack(xs[-depth:] + [x]), axis=1)
+                df = np.diff(np.column_stack(fs[-depth:] + [f]), axis=1)
+                gamma = np.linalg.lstsq(df, f, rcond=None)[0]
+                x_new = gx - (dx + df) @ gamma
+            else:
+                x_new = gx
+            if on_step is not None:
+                on_step(x[0] if scalar else x, x_new[0] if scalar else x_new)
+            if np.max(np.abs(f)) < tol:
+                return (float(x_new[0]) if scalar else x_new), k, k
+            xs.append(x)
+            fs.append(f)
+            x = x_new
+        return (float(x[0]) if scalar else x), max_iter, max_iter
+
+    raise ValueError(f"неизвестный способ итерации: {mode}")
+
+
+def _aitken(x0, x1, x2):
+    """
+    Ускоренное значение Δ²-процесса Эйткена по трём членам последовательности.
+    """
+    denominator = x2 - 2 * x1 + x0
+    if denominator == 0:
+        return x2
+    return x0 - (x1 - x0) ** 2 / denominator
+
+
+def _distance(a, b):
+    return float(np.max(np.abs(np.subtract(a, b))))
+
+
+# --- Пакетные версии: много начальных приближений одновременно ---
+#
+# Функции принимают массивы начальных приближений и выполняют итерации
+# сразу для всех элементов. Сошедшиеся элементы исключаются из расчёта.
+# Возвращается (корни, число итераций для каждого элемента, признак сходимости).
+
+def _start(*arrays):
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in arrays))
+    shape = arrays[0].shape
+    return shape, [x.ravel().copy() for x in arrays]
+
+
+def newton_batch(func, derivative, x, tol=1e-4, max_iter=10, method='dual'):
+    """
+    Метод Ньютона для массива начальных приближений x.
+    derivative=None — производная вычисляется автоматически
+    (способом method: 'dual' или 'complex').
+    """
+    shape, (x,) = _start(x)
+    iterations = np.zeros(x.size, dtype=int)
+    converged = np.zeros(x.size, dtype=bool)
+    active = np.arange(x.size)
+
+    with np.errstate(all='ignore'):
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            if derivative is None:
+                y, dy = value_and_derivative(func, x[active], method)
+            else:
+                y, dy = evaluate(func, x[active]), None
+            done = np.abs(y) < tol
+            converged[active[done]] = True
+            active, y = active[~done], y[~done]
+
+            dy = evaluate(derivative, x[active]) if dy is None else dy[~done]
+            x_new = x[active] - y / dy
+            iterations[active] += 1
+            ok = np.isfinite(x_new)
+            x[active[ok]] = x_new[ok]
+            active = active[ok]
+        if active.size:
+            converged[active] = np.abs(evaluate(func, x[active])) < tol
+
+    return x.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
+def secant_batch(func, x0, x1, tol=1e-4, max_iter=20):
+    """
+    Метод секущих для массивов пар начальных приближений x0, x1.
+    Значение функции в предыдущей точке переиспользуется, поэтому
+    на итерацию приходится одно вычисление функции.
+    """
+    shape, (x0, x1) = _start(x0, x1)
+    iterations = np.zeros(x1.size, dtype=int)
+    converged = np.zeros(x1.size, dtype=bool)
+    active = np.arange(x1.size)
+    # копии: значения меняются на месте, а func может возвращать массивы из кэша
+    y0 = np.array(evaluate(func, x0))
+    y1 = np.array(evaluate(func, x1))
+
+    with np.errstate(all='ignore'):
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            stalled = np.abs(y1[active] - y0[active]) < 1e-12
+            active = active[~stalled]
+
+            a0, a1 = x0[active], x1[active]
+            x2 = a1 - y1[active] * (a1 - a0) / (y1[active] - y0[active])
+            iterations[active] += 1
+            done = np.abs(x2 - a1) < tol
+            converged[active[done]] = True
+            x0[active], x1[active] = a1, x2
+            y0[active] = y1[active]
+
+            active = active[~done & np.isfinite(x2)]
+            y1[active] = evaluate(func, x1[active])
+
+    return x1.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
+def simple_iteration_batch(g, x0, tol=1e-4, max_iter=20):
+    """
+    Метод простой итерации для массива начальных приближений x0.
+    """
+    shape, (x,) = _start(x0)
+    iterations = np.zeros(x.size, dtype=int)
+    converged = np.zeros(x.size, dtype=bool)
+    active = np.arange(x.size)
+
+    with np.errstate(all='ignore'):
+        for _ in range(max_iter):
+            if active.size == 0:
+                break
+            x1 = evaluate(g, x[active])
+            iterations[active] += 1
+            done = np.abs(x1 - x[active]) < tol
+            converged[active[done]] = True
+            x[active] = x1
+            active = active[~done & np.isfinite(x1)]
+
+    return x.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
+def bisection_batch(func, a, b, precision=0.001):
+    """
+    Метод бисекции для массивов отрезков [a, b].
+    На каждой итерации функция вычисляется один раз — в середине.
+    Отрезки без смены знака на концах помечаются как несошедшиеся.
+    Отрезок, сжатый до соседних чисел с плавающей точкой, дальше
+    не делится, даже если precision меньше расстояния между ними.
+    precision — число или массив (своя точность для каждого отрезка).
+    """
+    shape, (a, b, precision) = _start(a, b, precision)
+    fa = np.array(evaluate(func, a))       # копия: меняется на месте
+    iterations = np.zeros(a.size, dtype=int)
+    converged = fa * evaluate(func, b) <= 0
+    active = np.flatnonzero(converged & (np.abs(b - a) > precision))
+
+    while active.size:
+        mid = (a[active] + b[active]) / 2
+        stuck = (mid == a[active]) | (mid == b[active])
+        active, mid = active[~stuck], mid[~stuck]
+        if not active.size:
+            break
+        fm = evaluate(func, mid)
+        iterations[active] += 1
+
+        exact = fm == 0
+        a[active[exact]] = b[active[exact]] = mid[exact]
+        left = ~exact & (fm * fa[active] < 0)
+        b[active[left]] = mid[left]
+        right = ~exact & ~left
+        a[active[right]] = mid[right]
+        fa[active[right]] = fm[right]
+
+        active = active[np.abs(b[active] - a[active]) > precision[active]]
+
+    return ((a + b) / 2).reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+
+def find_all(func, start=-10, end=10, samples=2001, precision=1e-12, ftol=1e-8, trace=None):
+    """
+    Находит все корни функции на отрезке [start, end].
+
+    Функция один раз вычисляется на равномерной сетке из samples точек.
+    Отрезки сетки со сменой знака уточняются одновременно пакетной
+    бисекцией; смены знака в полюсах (например, у tan(x)) и скачках
+    (sign(x)) отбрасываются: в настоящем корне |f| не больше, чем даёт
+    наклон f на отрезке сетки на ширине последнего отрезка бисекции,
+    а у скачка |f| остаётся порядка самого скачка. Локальные минимумы |f| без смены знака
+    (касание оси, кратный корень) уточняются золотым сечением и
+    принимаются, если |f| < ftol.
+
+    precision — точность корня относительно max(1, |x|): для корней
+    вдали от нуля абсолютная точность 1e-12 недостижима в числах
+    с плавающей точкой.
+    trace — журнал работы (solver_trace.Trace): каждый найденный корень
+    записывается как итерация с невязкой |f|.
+
+    Возвращает (отсортированный массив корней, число вычислений функции).
+    """
+    log = trace or NO_TRACE
+    log.start('find_all')
+    x = np.linspace(start, end, samples)
+    y = evaluate(func, x)
+    evaluations = samples
+
+    found = [x[y == 0]]
+    residuals = [np.zeros(found[0].size)]
+
+    # смена знака между соседними узлами
+    i = np.flatnonzero(y[:-1] * y[1:] < 0)
+    if i.size:
+        width = precision * np.maximum(1.0, np.maximum(np.abs(x[i]), np.abs(x[i + 1])))
+        r, iterations, _ = bisection_batch(func, x[i], x[i + 1], width)
+        evaluations += 2 * i.size + int(iterations.sum())
+        fr = np.abs(evaluate(func, r))
+        evaluations += i.size
+        slope = np.abs(y[i + 1] - y[i]) / (x[i + 1] - x[i])
+        reach = 10 * slope * np.maximum(width, 4 * np.spacing(np.abs(r)))
+        keep = (fr <= ftol) | (fr <= reach)
+        found.append(r[keep])
+        residuals.append(fr[keep])
+
+    # касание оси: локальный минимум |f| без смены знака
+    a = np.abs(y)
+    j = 1 + np.flatnonzero((a[1:-1] < a[:-2]) & (a[1:-1] <= a[2:]) & (y[:-2] * y[1:-1] > 0) & (y[1:-1] * y[2:] > 0))
+    if j.size:
+        lo, hi = x[j - 1], x[j + 1]
+        width = precision * np.maximum(1.0, np.abs(x[j]))
+        ratio = (math.sqrt(5) - 1) / 2
+        while np.any(hi - lo > width):
+            m1 = hi - ratio * (hi - lo)
+            m2 = lo + ratio * (hi - lo)
+            left = np.abs(evaluate(func, m1)) < np.abs(evaluate(func, m2))
+            evaluations += 2 * j.size
+            hi = np.where(left, m2, hi)
+            lo = np.where(left, lo, m1)
+        r = (lo + hi) / 2
+        fr = np.abs(evaluate(func, r))
+        evaluations += j.size
+        found.append(r[fr < ftol])
+        residuals.append(fr[fr < ftol])
+
+    result = np.concatenate(found)
+    order = np.argsort(result)
+    result, residual = result[order], np.concatenate(residuals)[order]
+    if result.size:
+        keep = np.concatenate(([True], np.diff(result) > 10 * precision * np.maximum(1.0, np.abs(result[1:]))))
+        result, residual = result[keep], residual[keep]
+
+    if trace is not None:
+        # сетка и бисекция считаются здесь, а не через trace.counted
+        trace.evaluations += evaluations
+    for root, value in zip(result, residual):
+        log.record(float(root), float(value))
+    log.finish('completed')
+    return result, evaluations
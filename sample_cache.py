@@ -0,0 +1,95 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+class SampleCache:
+    """
+    Ограниченный LRU-кэш значений функций.
+
+    Ключ — (функция, x) для отдельных точек или (функция, описание сетки)
+    для массивов. Размер кэша ограничен числом хранимых значений: массив
+    из n точек занимает n мест. При переполнении вытесняются записи,
+    которые дольше всего не использовались. Кэшем можно пользоваться
+    из нескольких потоков.
+    """
+
+    def __init__(self, maxsize=200000):
+        self.maxsize = maxsize
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def lookup(self, key, compute, weight=1):
+        """
+        Возвращает значение по ключу; при промахе вызывает compute()
+        и сохраняет результат.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return entry[0]
+            self.misses += 1
+
+        value = compute()
+        if weight <= self.maxsize:
+            with self._lock:
+                if key not in self._data:
+                    self._data[key] = (value, weight)
+                    self.size += weight
+                while self.size > self.maxsize:
+                    _, (_, old_weight) = self._data.popitem(last=False)
+                    self.size -= old_weight
+        return value
+
+    def wrap(self, function):
+        """
+        Возвращает функцию с тем же поведением, что function, но
+        с запоминанием значений. Принимает как числа, так и массивы NumPy.
+
+        Массивы значений хранятся и возвращаются только для чтения: один и тот
+        же массив получают все, кто попал в кэш, и запись в него испортила бы
+        кэш. Кому нужно менять результат, пусть сделает копию.
+        """
+        def frozen(x):
+            value = np.array(function(x))
+            value.setflags(write=False)
+            return value
+
+        def cached(x):
+            if isinstance(x, np.ndarray) and x.ndim > 0:
+                x = np.ascontiguousarray(x, dtype=float)
+                key = (function, x.shape, float(x.flat[0]), float(x.flat[-1]), hash(x.tobytes()))
+                return self.lookup(key, lambda: frozen(x), x.size)
+            x = float(x)
+            return self.lookup((function, x), lambda: function(x))
+        return cached
+
+    def clear(self):
+        """
+        Очищает кэш (например, при смене функции).
+        """
+        with self._lock:
+            self._data.clear()
+            self.size = 0
+
+    def stats(self):
+        """
+        Возвращает словарь со статистикой попаданий и промахов.
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._data),
+            'size': self.size,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,135 @@
+class Scene:
+    """
+    Холст Tkinter с сохраняемой сценой.
+
+    Рисунок делится на слои (оси, график, фигуры метода). Слой рисуется
+    внутри блока with scene.layer(имя, ключ); если ключ не изменился
+    с прошлого раза, слой не перерисовывается вовсе. Иначе вызовы
+    create_* не создают новые элементы, а переиспользуют элементы слоя
+    того же типа: меняются только координаты (coords) и, если нужно,
+    параметры (itemconfigure). Лишние элементы удаляются в конце блока.
+
+    Все остальные методы и параметры передаются холсту как есть, поэтому
+    объект можно передавать туда же, куда и сам холст.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.calls = 0          # число обращений к холсту из слоёв
+        self._order = []        # слои снизу вверх
+        self._keys = {}
+        self._items = {}        # слой -> [(тип, id, параметры)]
+        self._current = None
+        self._position = 0
+        self._created = False
+
+    def __getattr__(self, name):
+        if name.startswith('create_'):
+            kind = name[len('create_'):]
+            return lambda *args, **options: self._create(kind, args, options)
+        return getattr(self.canvas, name)
+
+    def __getitem__(self, key):
+        return self.canvas[key]
+
+    def layer(self, name, key=None):
+        """
+        Возвращает контекстный менеджер слоя name. Значение в with —
+        True, если слой нужно нарисовать, и False, если ключ key
+        совпал с прошлым (тогда рисовать не нужно).
+        key=None — слой перерисовывается всегда.
+        """
+        return _Layer(self, name, key)
+
+    def add_layers(self, *names):
+        """
+        Заранее задаёт порядок слоёв снизу вверх (иначе слои идут
+        в порядке первого рисования).
+        """
+        for name in names:
+            if name not in self._items:
+                self._order.append(name)
+                self._items[name] = []
+
+    def invalidate(self, name=None):
+        """
+        Сбрасывает ключ слоя name (или всех слоёв): при следующем
+        вызове слой будет нарисован заново.
+        """
+        if name is None:
+            self._keys.clear()
+        else:
+            self._keys.pop(name, None)
+
+    def _create(self, kind, args, options):
+        if self._current is None:
+            return getattr(self.canvas, 'create_' + kind)(*args, **options)
+
+        self.calls += 1
+        tags = options.get('tags', ())
+        tags = (tags,) if isinstance(tags, str) else tuple(tags)
+        options = dict(options, tags=tags + (self._current,))
+        items = self._items[self._current]
+        if self._position < len(items) and items[self._position][0] == kind:
+            _, item, old = items[self._position]
+            self.canvas.coords(item, *args)
+            if options != old:
+                self.canvas.itemconfigure(item, **options)
+                self.calls += 1
+        else:
+            if self._position < len(items):
+                self.canvas.delete(items[self._position][1])
+                self.calls += 1
+            item = getattr(self.canvas, 'create_' + kind)(*args, **options)
+            self._created = True
+        entry = (kind, item, options)
+        if self._position < len(items):
+            items[self._position] = entry
+        else:
+            items.append(entry)
+        self._position += 1
+        return item
+
+
+class _Layer:
+    """
+    Контекстный менеджер одного слоя сцены (см. Scene.layer).
+    """
+
+    def __init__(self, scene, name, key):
+        self.scene = scene
+        self.name = name
+        self.key = key
+        self.active = False
+
+    def __enter__(self):
+        scene = self.scene
+        if self.name not in scene._items:
+            scene.add_layers(self.name)
+        elif self.key is not None and self.name in scene._keys and scene._keys[self.name] == self.key:
+            return False
+        scene._keys[self.name] = self.key
+        scene._current = self.name
+        scene._position = 0
+        scene._created = False
+        self.active = True
+        return True
+
+    def __exit__(self, *exc_info):
+        if not self.active:
+            return False
+        scene = self.scene
+        items = scene._items[self.name]
+        for _, item, _ in items[scene._position:]:
+            scene.canvas.delete(item)
+            scene.calls += 1
+        del items[scene._position:]
+        scene._current = None
+        if exc_info[0] is not None:
+            scene._keys.pop(self.name, None)
+        # новые элементы оказались поверх всех; поднимаем слои, лежащие выше
+        if scene._created:
+            for name in scene._order[scene._order.index(self.name) + 1:]:
+                scene.canvas.tag_raise(name)
+                scene.calls += 1
+        return False
@@ -0,0 +1,55 @@
+class RedrawScheduler:
+    """
+    Объединяет частые запросы на перерисовку в одну.
+
+    Пока перерисовка запланирована, новые запросы не ставятся в очередь,
+    а только учитываются как пропущенные: при срабатывании callback
+    рисует последнее состояние. Если задана задержка delay (в мс),
+    таймер перезапускается при каждом запросе (debounce), иначе
+    перерисовка выполняется, когда Tk освободится (after_idle).
+    """
+
+    def __init__(self, widget, callback, delay=0):
+        self.widget = widget
+        self.callback = callback
+        self.delay = delay
+        self.requests = 0
+        self.runs = 0
+        self.skipped = 0
+        self._pending = None
+
+    def request(self):
+        """
+        Запрашивает перерисовку.
+        """
+        self.requests += 1
+        if self._pending is not None:
+            self.skipped += 1
+            if not self.delay:
+                return
+            self.widget.after_cancel(self._pending)
+        if self.delay:
+            self._pending = self.widget.after(self.delay, self._run)
+        else:
+            self._pending = self.widget.after_idle(self._run)
+
+    def cancel(self):
+        """
+        Отменяет запланированную перерисовку.
+        """
+        if self._pending is not None:
+            self.widget.after_cancel(self._pending)
+            self._pending = None
+
+    def flush(self):
+        """
+        Немедленно выполняет запланированную перерисовку, если она есть.
+        """
+        if self._pending is not None:
+            self.cancel()
+            self._run()
+
+    def _run(self):
+        self._pending = None
+        self.runs += 1
+        self.callback()
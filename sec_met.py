@@ -1,4 +1,6 @@
 import tkinter as tk
+from curve import plot_adaptive
+import roots
 
 def init_window(width: int, height: int):
     """
@@ -48,26 +50,17 @@ def func(x):
     """
     return x ** 2 - 2
 
-def plot_function(canvas, width: int, height: int, scale: float, step=0.05):
+def plot_function(canvas, width: int, height: int, scale: float, tolerance=0.5):
     """
     Строит график функции f(x)
         canvas (tk.Canvas): поле для рисования.
         width (int): Ширина окна.
         height (int): Высота окна.
         scale (float): Масштаб координат.
-        step (float, optional): Шаг по оси X для прорисовки (по умолчанию 0.05).
+        tolerance (float, optional): Допустимое отклонение ломаной от графика в пикселях (по умолчанию 0.5).
     """
     center_x, center_y = width // 2, height // 2
-    x = -10
-    while x <= 10:
-        x1, y1 = x, func(x)
-        x2, y2 = x + step, func(x + step)
-        canvas.create_line(
-            center_x + x1 * scale, center_y - y1 * scale,
-            center_x + x2 * scale, center_y - y2 * scale,
-            fill="cyan", width=2
-        )
-        x += step
+    plot_adaptive(canvas, func, -10, 10, scale, center_x, center_y, tolerance, fill="cyan", width=2)
 
 def draw_secant(canvas, width: int, height: int, x0: float, y0: float, x1: float, y1: float, scale: float):
     """
@@ -107,7 +100,8 @@ def mark_root(canvas, width: int, height: int, x_root: float, scale: float):
     canvas.create_text(center_x + x_root * scale + 10, center_y - y_root * scale - 10,
                        text=f"{x_root:.4f}", fill="red", font=("Arial", 10, "bold"))
 
-def secant_visualization(canvas, width: int, height: int, x0: float, x1: float, scale: float, tol=1e-4, max_iter=20):
+def secant_visualization(canvas, width: int, height: int, x0: float, x1: float, scale: float, tol=1e-4, max_iter=20,
+                         trace=None):
     """
     Реализует метод секущих с визуализацией процесса на графике.
         canvas (tk.Canvas): Канвас для рисования.
@@ -118,25 +112,14 @@ def secant_visualization(canvas, width: int, height: int, x0: float, x1: float,
         scale (float): Масштаб координат.
         tol (float, optional): Допустимая погрешность нахождения корня (по умолчанию 1e-4).
         max_iter (int, optional): Максимальное количество итераций (по умолчанию 20).
+        trace (solver_trace.Trace, optional): Журнал работы метода (по умолчанию не ведётся).
     """
-    for _ in range(max_iter):
-        y0 = func(x0)
-        y1 = func(x1)
-
-        if abs(y1 - y0) < 1e-12:
-            break
-
-        draw_secant(canvas, width, height, x0, y0, x1, y1, scale)
-
-        x2 = x1 - y1 * (x1 - x0) / (y1 - y0)
-
-        if abs(x2 - x1) < tol:
-            mark_root(canvas, width, height, x2, scale)
-            return
-
-        x0, x1 = x1, x2
-
-    mark_root(canvas, width, height, x1, scale)
+    x_root = roots.secant(
+        func, x0, x1, tol, max_iter,
+        on_step=lambda x0, y0, x1, y1: draw_secant(canvas, width, height, x0, y0, x1, y1, scale),
+        trace=trace
+    )
+    mark_root(canvas, width, height, x_root, scale)
 
 if __name__ == "__main__":
     width, height = 800, 800
@@ -147,4 +130,10 @@ if __name__ == "__main__":
     plot_function(canvas, width, height, scale)
     secant_visualization(canvas, width, height, x0=1.0, x1=2.0, scale=scale)
 
+    # Все корни на отображаемом отрезке [-10, 10], а не только ближайший к начальному приближению
+    all_roots, evaluations = roots.find_all(func, -10, 10)
+    for x_root in all_roots:
+        mark_root(canvas, width, height, x_root, scale)
+    print(f"Корни: {', '.join(f'{x_root:.6f}' for x_root in all_roots)} ({evaluations} вычислений функции)")
+
     window.mainloop()
@@ -1,35 +1,47 @@
 import tkinter as tk
-import math
+from functools import partial
+import numpy as np
+import quadrature
+import singular
+from antiderivative import Antiderivative
+from expression import compile_expression, ExpressionError
+from sample_cache import SampleCache
+from curve import adaptive_sample, draw_curve, draw_envelope, MIN_SHAPE_WIDTH
+from scheduler import RedrawScheduler
+from scene import Scene
+from view import ZoomPan
+from worker import Worker, integrate
 
 # --- Исходные параметры ---
 a, b = 0.0, 1.0
 n = 10
+tol = 1e-10
 scale = 100
 center_x, center_y = 400, 300
 graph_start, graph_end = -5, 5
+sampled = None  # область, для которой построен график на холсте (см. resample)
 
-# --- Целевая функция ---
-def f(x):
-    return math.tan(x)
+# --- Целевая функция (формула из поля ввода, см. expression.py) ---
+expression_text = "tan(x)"
+f = compile_expression(expression_text)
+
+# --- Кэш значений f, общий для графика и интегрирования ---
+samples = SampleCache()
+f_cached = samples.wrap(f)
+
+# --- Таблица первообразной f: интеграл по любому [a, b] — два обращения к таблице ---
+antiderivative = Antiderivative(f, tol)
 
 # --- Метод Симпсона ---
-def simpson_method(func, start, end, steps):
+def simpson_method(func, start, end, steps, trace=None):
     if steps % 2 != 0:
         steps += 1
-    h = (end - start) / steps
-    total = 0
     try:
-        total += func(start) + func(end)
+        func(start), func(end)
     except:
         return float('nan')
-    for i in range(1, steps):
-        x = start + i * h
-        coeff = 4 if i % 2 != 0 else 2
-        try:
-            total += coeff * func(x)
-        except:
-            continue
-    return (h / 3) * total
+    # точка, где функция не вычисляется, делает результат nan, а не пропускается
+    return quadrature.simpson(func, start, end, steps, fill=np.nan, trace=trace)
 
 # --- Рисуем оси ---
 def draw_axes(canvas):
@@ -45,27 +57,29 @@ def draw_axes(canvas):
             canvas.create_text(center_x + 20, y, text=str(i))
 
 # --- Рисуем график функции ---
-def draw_function(canvas):
-    step = 0.01
-    x = graph_start
-    prev = None
-    while x <= graph_end:
-        try:
-            y = f(x)
-            if abs(y) > 1e4:
-                prev = None
-                x += step
-                continue
-            sx = center_x + x * scale
-            sy = center_y - y * scale
-        except:
-            prev = None
-            x += step
-            continue
-        if prev:
-            canvas.create_line(prev[0], prev[1], sx, sy, fill="blue")
-        prev = (sx, sy)
-        x += step
+# Точки сгущаются на изгибах; в полюсах и разрывах adaptive_sample
+# вставляет точку с y = nan, и линия обрывается.
+def draw_function(canvas, start=graph_start, finish=graph_end, samples=None):
+    if samples is None:
+        height = float(canvas['height'])
+        samples = adaptive_sample(f, start, finish, scale, ((center_y - height) / scale, center_y / scale))
+    x, y = samples[:2]
+    draw_curve(canvas, zip(center_x + x * scale, center_y - y * scale), fill="blue")
+
+# --- Пересчёт графика в фоне, когда его точек на экране стало мало ---
+def resample():
+    start, finish, step, low, high = target = view.sample_range()
+    function = f
+    sample_worker.submit(lambda job: adaptive_sample(function, start, finish, 1 / step, (low, high)),
+                         on_result=lambda samples: draw_sampled(target, samples))
+
+def draw_sampled(target, samples):
+    global sampled, scale, center_x, center_y
+    sampled = target
+    scale, center_x, center_y = view.scale, view.center_x, view.center_y
+    with canvas.layer('function', (target, expression_text)) as stale:
+        if stale:
+            draw_function(canvas, target[0], target[1], samples)
 
 # --- Рисуем визуализацию Симпсона ---
 def draw_simpson(canvas):
@@ -74,14 +88,21 @@ def draw_simpson(canvas):
     if steps % 2 != 0:
         steps += 1
     h = (b - a) / steps
+    if 2 * h * scale < MIN_SHAPE_WIDTH:
+        # параболы уже нескольких пикселей: одна огибающая по узлам сетки
+        x = quadrature.grid(a, b, steps)
+        y = quadrature.evaluate(f_cached, x, fill=np.nan)
+        draw_envelope(canvas, center_x + x * scale, center_y - y * scale, center_y,
+                      fill="#c2f0c2", outline="green")
+        return
     for i in range(0, steps, 2):
         x0 = a + i*h
         x1 = x0 + h
         x2 = x0 + 2*h
         try:
-            y0 = f(x0)
-            y1 = f(x1)
-            y2 = f(x2)
+            y0 = f_cached(x0)
+            y1 = f_cached(x1)
+            y2 = f_cached(x2)
         except:
             continue
         poly = []
@@ -100,87 +121,209 @@ def draw_simpson(canvas):
         coords = [c for p in poly for c in p]
         canvas.create_polygon(coords, fill="#c2f0c2", outline="green")
 
-# --- Перерисовка ---
-def run_method():
-    global a, b, n, scale
+# --- Чтение границ ---
+def read_bounds():
+    global a, b
     try:
         a = float(entry_a.get())
         b = float(entry_b.get())
     except ValueError:
         result_label.config(text="Ошибка: некорректный ввод a или b")
+        return False
+    return True
+
+# --- Чтение формулы ---
+def read_function():
+    global f, f_cached, antiderivative, expression_text, sampled
+    text = entry_f.get().strip()
+    if text == expression_text:
+        return True
+    try:
+        f = compile_expression(text)
+    except ExpressionError as e:
+        result_label.config(text=f"Ошибка в формуле: {e}")
+        return False
+    expression_text, sampled = text, None
+    samples.clear()
+    f_cached = samples.wrap(f)
+    antiderivative = Antiderivative(f, tol)
+    return True
+
+# --- Перерисовка ---
+def run_method():
+    global a, b, n, scale, center_x, center_y
+    if not (read_function() and read_bounds()):
         return
 
-    canvas.delete("all")
-    draw_axes(canvas)
-    draw_function(canvas)
-    draw_simpson(canvas)
+    # слои сцены перерисовываются, только если изменилось то, от чего они зависят
+    scale, center_x, center_y = view.scale, view.center_x, view.center_y
+    with canvas.layer('axes', (scale, center_x, center_y)) as stale:
+        if stale:
+            draw_axes(canvas)
+    if not view.covers(sampled):
+        resample()
+    with canvas.layer('simpson', (a, b, n, scale, center_x, center_y, expression_text)) as stale:
+        if stale:
+            draw_simpson(canvas)
+    # интеграл считается в фоне; новый запуск отменяет предыдущий
+    steps = n + n % 2
+    integral_worker.submit(
+        partial(simpson_checked, start=a, finish=b, steps=steps, principal=principal_value.get(),
+                table=antiderivative),
+        on_result=show_simpson,
+        on_progress=show_progress,
+        on_error=show_error)
+
+# --- Симпсон с проверкой особенностей ---
+def simpson_checked(job, start, finish, steps, principal, table):
+    # при полюсе на отрезке формула Симпсона не сходится ни при каком n,
+    # а в устранимой особенности узел сетки может дать nan:
+    # отрезок делится в особых точках (см. singular.integrate)
+    points, _ = singular.find_singularities(f_cached, start, finish)
+    if any(kind in ('pole', 'removable') for _, kind in points):
+        return singular.integrate(f_cached, start, finish, tol, principal)
+    value = integrate(job, simpson_method, f_cached, start, finish, steps, align=2)
+    # точное значение для сравнения — из таблицы первообразной
+    # (строится при первом запросе, дальше новые a и b почти ничего не стоят)
     try:
-        result = simpson_method(f, a, b, n)
-        result_label.config(text=f"Симпсон: {result:.6f}")
-    except Exception as e:
+        exact = table.integral(start, finish)
+    except ValueError:
+        exact = float('nan')
+    return value, exact
+
+def show_simpson(result):
+    if len(result) == 4:
+        value, error, _, points = result
+        poles = ", ".join(f"{x:.4f}" for x, kind in points if kind == 'pole')
+        if poles:
+            kind = "главное значение" if principal_value.get() else "с учётом особенностей"
+            text = f"Полюс x = {poles}; {kind}"
+        else:
+            removable = ", ".join(f"{x:.4f}" for x, kind in points if kind == 'removable')
+            text = f"Устранимая особенность x = {removable}; с учётом особенностей"
+        result_label.config(text=f"{text}: {value:.10f} ± {error:.1e}")
+    else:
+        value, exact = result
+        result_label.config(text=f"Симпсон: {value:.6f} (точно: {exact:.10f})")
+
+# --- Прогресс и ошибки фонового вычисления ---
+def show_progress(progress):
+    result_label.config(text=f"Вычисление: {progress:.0%}")
+
+def show_error(e):
+    if isinstance(e, singular.DivergentIntegral):
+        result_label.config(text=f"Интеграл расходится: полюс x = {e.point:.6f}")
+    else:
         result_label.config(text=f"Ошибка вычисления: {e}")
 
-# --- Обновление масштаба ---
+# --- Адаптивный метод (Гаусс–Кронрод с контролем погрешности) ---
+# Отрезок заранее делится в полюсах и разрывах функции.
+def run_adaptive():
+    if not (read_function() and read_bounds()):
+        return
+    def show_result(result):
+        value, error, evaluations, points = result
+        split = f", особых точек: {len(points)}" if points else ""
+        result_label.config(text=f"Адаптивно: {value:.10f} ± {error:.1e} ({evaluations} вычислений f{split})")
+
+    start, finish, principal = a, b, principal_value.get()
+    integral_worker.submit(lambda job: singular.integrate(f_cached, start, finish, tol, principal),
+                           on_result=show_result, on_progress=show_progress, on_error=show_error)
+
+# --- Обновление масштаба (ползунок) ---
 def update_scale(val):
-    global scale
-    scale = int(val)
-    run_method()
+    if abs(int(val) - view.scale) >= 1:
+        view.zoom_to(int(val))
+
+# --- Масштабирование колесом или перетаскивание закончилось ---
+def on_view_change(view):
+    scale_slider.set(round(view.scale))
+    redraw_scheduler.request()
 
 # --- Обновление количества сегментов ---
 def update_n(val):
     global n
     n = int(val)
-    run_method()
+    redraw_scheduler.request()
+
+if __name__ == "__main__":
+    # --- UI ---
+    root = tk.Tk()
+    root.title("Метод Симпсона — f(x) + масштаб + ввод границ + количество сегментов")
+    root.resizable(False, False)
+
+    # Перерисовки при движении ползунков объединяются в одну
+    redraw_scheduler = RedrawScheduler(root, run_method, delay=20)
+
+    # Фоновые потоки для вычисления интегралов и точек графика
+    integral_worker = Worker(root)
+    sample_worker = Worker(root)
+
+    # Холст с сохраняемой сценой (см. scene.Scene)
+    canvas = Scene(tk.Canvas(root, width=800, height=600, bg="white"))
+    canvas.add_layers('axes', 'function', 'simpson')
+    canvas.pack()
+
+    # Колесо мыши — масштаб, перетаскивание — сдвиг
+    view = ZoomPan(canvas, scale, center_x, center_y, on_view_change, min_scale=30, max_scale=300)
+
+    # --- Контрольная панель ---
+    control_frame = tk.Frame(root)
+    control_frame.pack(pady=5)
+
+    tk.Label(control_frame, text="f(x) =").pack(side=tk.LEFT)
+    entry_f = tk.Entry(control_frame, width=20)
+    entry_f.pack(side=tk.LEFT)
+    entry_f.insert(0, expression_text)
+    entry_f.bind("<Return>", lambda event: run_method())
 
-# --- UI ---
-root = tk.Tk()
-root.title("Метод Симпсона — tan(x) + масштаб + ввод границ + количество сегментов")
-root.resizable(False, False)
-
-canvas = tk.Canvas(root, width=800, height=600, bg="white")
-canvas.pack()
-
-# --- Контрольная панель ---
-control_frame = tk.Frame(root)
-control_frame.pack(pady=5)
-
-tk.Label(control_frame, text="a =").pack(side=tk.LEFT)
-entry_a = tk.Entry(control_frame, width=8)
-entry_a.pack(side=tk.LEFT)
-entry_a.insert(0, str(a))
-
-tk.Label(control_frame, text="b =").pack(side=tk.LEFT)
-entry_b = tk.Entry(control_frame, width=8)
-entry_b.pack(side=tk.LEFT)
-entry_b.insert(0, str(b))
-
-btn_run = tk.Button(control_frame, text="Вычислить", command=run_method)
-btn_run.pack(side=tk.LEFT, padx=10)
-
-# --- Масштаб ---
-scale_frame = tk.Frame(root)
-scale_frame.pack()
-
-tk.Label(scale_frame, text="Масштаб").pack()
-scale_slider = tk.Scale(scale_frame, from_=30, to=300,
-                        orient=tk.HORIZONTAL, command=update_scale)
-scale_slider.set(scale)
-scale_slider.pack()
-
-# --- Кол-во сегментов ---
-segments_frame = tk.Frame(root)
-segments_frame.pack()
-
-tk.Label(segments_frame, text="Сегменты (n)").pack()
-segments_slider = tk.Scale(segments_frame, from_=2, to=200, resolution=2,
-                           orient=tk.HORIZONTAL, command=update_n)
-segments_slider.set(n)
-segments_slider.pack()
-
-# --- Результат ---
-result_label = tk.Label(root, text="Симпсон: ", font=("Arial", 12))
-result_label.pack(pady=5)
-
-# --- Первый запуск ---
-run_method()
-root.mainloop()
+    tk.Label(control_frame, text="a =").pack(side=tk.LEFT)
+    entry_a = tk.Entry(control_frame, width=8)
+    entry_a.pack(side=tk.LEFT)
+    entry_a.insert(0, str(a))
+
+    tk.Label(control_frame, text="b =").pack(side=tk.LEFT)
+    entry_b = tk.Entry(control_frame, width=8)
+    entry_b.pack(side=tk.LEFT)
+    entry_b.insert(0, str(b))
+
+    btn_run = tk.Button(control_frame, text="Вычислить", command=run_method)
+    btn_run.pack(side=tk.LEFT, padx=10)
+
+    btn_adaptive = tk.Button(control_frame, text="Адаптивно", command=run_adaptive)
+    btn_adaptive.pack(side=tk.LEFT)
+
+    # Для полюса внутри отрезка — главное значение по Коши
+    principal_value = tk.BooleanVar(value=False)
+    tk.Checkbutton(control_frame, text="Главное значение", variable=principal_value).pack(side=tk.LEFT, padx=5)
+
+    # --- Масштаб ---
+    scale_frame = tk.Frame(root)
+    scale_frame.pack()
+
+    tk.Label(scale_frame, text="Масштаб").pack()
+    scale_slider = tk.Scale(scale_frame, from_=30, to=300,
+                            orient=tk.HORIZONTAL, command=update_scale)
+    scale_slider.set(scale)
+    scale_slider.pack()
+
+    # --- Кол-во сегментов ---
+    segments_frame = tk.Frame(root)
+    segments_frame.pack()
+
+    tk.Label(segments_frame, text="Сегменты (n)").pack()
+    segments_slider = tk.Scale(segments_frame, from_=2, to=200, resolution=2,
+                               orient=tk.HORIZONTAL, command=update_n)
+    segments_slider.set(n)
+    segments_slider.pack()
+
+    # --- Результат ---
+    result_label = tk.Label(root, text="Симпсон: ", font=("Arial", 12))
+    result_label.pack(pady=5)
+
+    # --- Первый запуск ---
+    run_method()
+    root.mainloop()
+    integral_worker.shutdown()
+    sample_worker.shutdown()
+    print(f"Перерисовок: {redraw_scheduler.runs}, пропущено: {redraw_scheduler.skipped}")
@@ -0,0 +1,252 @@
+import math
+
+import numpy as np
+
+import quadrature
+from quadrature import evaluate
+from solver_trace import NO_TRACE
+
+
+class DivergentIntegral(ArithmeticError):
+    """
+    Интеграл расходится (неинтегрируемая особенность функции).
+    """
+
+    def __init__(self, point):
+        super().__init__(f"интеграл расходится: неинтегрируемая особенность в x = {point:.6g}")
+        self.point = point
+
+
+def find_singularities(function, start, finish, samples=1025):
+    """
+    Ищет полюсы и разрывы функции на отрезке [start, finish].
+
+    Функция вычисляется на равномерной сетке. Особенностями считаются:
+    узлы, где значение не число (nan, inf) или не вычисляется (вид такой
+    точки определяется по значениям рядом, см. _classify);
+    смены знака, около которых |f| растёт (полюс, как у tan(x)) или
+    значение скачком меняется (разрыв); резкие пики |f| без смены знака
+    (полюс чётного порядка, как у 1/x²).
+
+    Возвращает (список пар (x, вид), число вычислений функции), где
+    вид — 'pole', 'jump' или 'removable' (устранимая особенность: функция
+    не вычисляется только в самой точке, как sin(x)/x в нуле).
+    """
+    x = np.linspace(start, finish, samples)
+    y = evaluate(function, x, fill=np.nan)
+    evaluations = samples
+    eps = 1e-9 * (finish - start)
+    found = []
+    for t in x[~np.isfinite(y)]:
+        kind, count = _classify(function, t, x[1] - x[0])
+        found.append((float(t), kind))
+        evaluations += count
+    a = np.abs(y)
+
+    finite = np.isfinite(y[:-1]) & np.isfinite(y[1:])
+    i = np.flatnonzero(finite & (y[:-1] * y[1:] < 0))
+    if i.size:
+        r, count = _locate(function, x[i], x[i + 1])
+        evaluations += count
+        left = np.abs(evaluate(function, r - eps, fill=np.inf))
+        right = np.abs(evaluate(function, r + eps, fill=np.inf))
+        evaluations += 2 * i.size
+        ends = np.maximum(a[i], a[i + 1])
+        lows = np.minimum(a[i], a[i + 1])
+        jump = np.abs(evaluate(function, r - eps, fill=0.0) - evaluate(function, r + eps, fill=0.0))
+        evaluations += 2 * i.size
+        for k in range(i.size):
+            if min(left[k], right[k]) > 100 * lows[k]:
+                found.append((float(r[k]), 'pole'))
+            elif jump[k] > 0.5 * ends[k]:
+                found.append((float(r[k]), 'jump'))
+
+    # пики |f| без смены знака
+    scale = np.median(a[np.isfinite(a)]) if np.isfinite(a).any() else 0.0
+    j = 1 + np.flatnonzero((a[1:-1] > a[:-2]) & (a[1:-1] >= a[2:]) & (a[1:-1] > 1e2 * max(scale, 1e-300))
+                           & (y[:-2] * y[1:-1] > 0) & (y[1:-1] * y[2:] > 0))
+    for k in j:
+        lo, hi = x[k - 1], x[k + 1]
+        ratio = (math.sqrt(5) - 1) / 2
+        while hi - lo > 1e-14 * (finish - start):
+            m1 = hi - ratio * (hi - lo)
+            m2 = lo + ratio * (hi - lo)
+            if abs(function(m1)) > abs(function(m2)):
+                hi = m2
+            else:
+                lo = m1
+            evaluations += 2
+        # узкий гладкий пик не полюс: в вершине |f| почти не растёт
+        top = (lo + hi) / 2
+        peak = abs(evaluate(function, np.array([top]), fill=np.inf)[0])
+        evaluations += 1
+        if not peak < 1e3 * a[k]:
+            found.append((top, 'pole'))
+
+    found.sort()
+    merged = []
+    for point, kind in found:
+        if merged and point - merged[-1][0] <= 1e-12 * (finish - start):
+            continue
+        merged.append((float(point), kind))
+    return merged, evaluations
+
+
+def _classify(function, point, h, steps=6):
+    """
+    Вид особенности в точке point, где функция не вычисляется.
+
+    Функция вычисляется по обе стороны от point на расстояниях
+    h·10^-1, ..., h·10^-steps. Если |f| растёт и приращения не убывают
+    (1/x, 1/√|x|, log|x|), это полюс; если приращения быстро затухают,
+    у функции есть предел: при равных пределах слева и справа особенность
+    устранимая (sin(x)/x в нуле), иначе — разрыв (|x|/x).
+    Возвращает (вид, число вычислений функции).
+    """
+    d = h * 10.0 ** -np.arange(1, steps + 1)
+    left = evaluate(function, point - d, fill=np.nan)
+    right = evaluate(function, point + d, fill=np.nan)
+    evaluations = 2 * steps
+    if not (np.all(np.isfinite(left)) and np.all(np.isfinite(right))):
+        return 'pole', evaluations
+    growth = np.diff(np.maximum(np.abs(left), np.abs(right)))
+    if np.all(growth > 0) and growth[-1] > 0.1 * growth[0]:
+        return 'pole', evaluations
+    if abs(left[-1] - right[-1]) > 1e-6 * max(abs(left[-1]), abs(right[-1]), 1.0):
+        return 'jump', evaluations
+    return 'removable', evaluations
+
+
+def _locate(function, a, b):
+    """
+    Уточняет смену знака на отрезках [a, b] бисекцией до соседних чисел
+    с плавающей точкой: полюс надо знать так точно, как это возможно,
+    иначе сумма f(p - u) + f(p + u) около него не сокращается.
+    Возвращает (точки, число вычислений функции).
+    """
+    a, b = a.copy(), b.copy()
+    fa = np.array(evaluate(function, a, fill=np.nan))     # копия: меняется на месте
+    evaluations = a.size
+    active = np.arange(a.size)
+    while active.size:
+        mid = (a[active] + b[active]) / 2
+        done = (mid == a[active]) | (mid == b[active])
+        active, mid = active[~done], mid[~done]
+        fm = evaluate(function, mid, fill=np.nan)
+        evaluations += mid.size
+        left = np.sign(fm) * np.sign(fa[active]) < 0
+        b[active[left]] = mid[left]
+        a[active[~left]] = mid[~left]
+        fa[active[~left]] = fm[~left]
+    return (a + b) / 2, evaluations
+
+
+def _tail_diverges(function, point, direction, length, tol):
+    """
+    Проверяет, сходится ли интеграл у особой точки point.
+
+    Считаются интегралы по отрезкам [point + direction·L·10^-(k+1),
+    point + direction·L·10^-k]. Если особенность интегрируема, они быстро
+    убывают; при расходимости (например, полюс 1/x) почти не меняются.
+    Возвращает (расходится ли, число вычислений функции).
+    """
+    pieces = []
+    evaluations = 0
+    for k in range(1, 8):
+        near, far = sorted((point + direction * length * 10.0 ** -(k + 1), point + direction * length * 10.0 ** -k))
+        value, _, count = quadrature.adaptive(function, near, far, tol)
+        pieces.append(abs(value))
+        evaluations += count
+    ratios = [b / a for a, b in zip(pieces[-3:-1], pieces[-2:]) if a > 0]
+    return pieces[-1] > tol and bool(ratios) and min(ratios) > 0.9, evaluations
+
+
+def _toward(function, regular, point, tol):
+    """
+    Интеграл от regular до особой точки point с заменой x = point ∓ u²,
+    которая сглаживает особенности вида 1/√|x - point| и log|x - point|.
+    """
+    sign = 1.0 if point > regular else -1.0
+    length = math.sqrt(abs(point - regular))
+    value, error, evaluations = quadrature.adaptive(
+        lambda u: evaluate(function, point - sign * u * u) * 2 * u, 0.0, length, tol)
+    return sign * value, error, evaluations
+
+
+def integrate(function, start, finish, tol=1e-10, principal_value=False, samples=1025, trace=None):
+    """
+    Интеграл с учётом особенностей функции.
+
+    Отрезок делится в найденных полюсах и разрывах (find_singularities).
+    Части, прилегающие к полюсу, считаются с заменой переменной после
+    проверки сходимости; неинтегрируемая особенность приводит к
+    исключению DivergentIntegral. Если principal_value=True, для полюса
+    внутри отрезка вычисляется главное значение по Коши:
+    ∫ f(p - u) + f(p + u) du около полюса p.
+    trace — журнал работы (solver_trace.Trace): после каждой части
+    записываются накопленная сумма и оценка погрешности.
+
+    Возвращает (значение, оценка погрешности, число вычислений функции,
+    список особенностей).
+    """
+    log = trace or NO_TRACE
+    log.start('singular')
+    points, evaluations = find_singularities(function, start, finish, samples)
+    for end in (start, finish):
+        if not np.isfinite(evaluate(function, np.array([end]), fill=np.nan)[0]):
+            if not any(abs(p - end) <= 1e-12 * (finish - start) for p, _ in points):
+                points.append((end, 'pole'))
+        evaluations += 1
+    points.sort()
+
+    inner = [(p, kind) for p, kind in points if start < p < finish]
+    breaks = [start] + [p for p, _ in inner] + [finish]
+    singular = {p for p, kind in points if kind == 'pole'}
+    # радиус окрестности полюса для главного значения
+    radius = {}
+    if principal_value:
+        for k in range(1, len(breaks) - 1):
+            if breaks[k] in singular:
+                radius[breaks[k]] = min(breaks[k] - breaks[k - 1], breaks[k + 1] - breaks[k]) / 4
+
+    total = error = 0.0
+    for left, right in zip(breaks[:-1], breaks[1:]):
+        lo = left + radius.get(left, 0.0)
+        hi = right - radius.get(right, 0.0)
+        middle = (lo + hi) / 2
+        for a, b, point in ((lo, middle, left), (middle, hi, right)):
+            if point in singular and point not in radius:
+                direction = 1.0 if point == a else -1.0
+                diverges, count = _tail_diverges(function, point, direction, b - a, tol / 100)
+                evaluations += count
+                if diverges:
+                    raise DivergentIntegral(point)
+                value, err, count = _toward(function, b if point == a else a, point, tol)
+                value = value if point == b else -value
+            else:
+                value, err, count = quadrature.adaptive(function, a, b, tol)
+            total += value
+            error += err
+            evaluations += count
+            log.record(total, error)
+
+    for p, delta in radius.items():
+        # главное значение существует, если у полюса значения слева и справа
+        # почти взаимно уничтожаются (полюс нечётного порядка)
+        u = delta * 1e-6
+        left, right = evaluate(function, np.array([p - u, p + u]), fill=np.nan)
+        evaluations += 2
+        if not abs(left + right) < 1e-2 * (abs(left) + abs(right)):
+            raise DivergentIntegral(p)
+        folded = lambda u, p=p: evaluate(function, p - u) + evaluate(function, p + u)
+        value, err, count = quadrature.adaptive(folded, 0.0, delta, tol)
+        total += value
+        error += err
+        evaluations += count
+        log.record(total, error)
+
+    if trace is not None:
+        # вычисления считаются по частям, а не через trace.counted
+        trace.evaluations += evaluations
+    log.finish('completed')
+    return total, error, evaluations, points
@@ -0,0 +1,102 @@
+import time
+
+import numpy as np
+
+
+class Trace:
+    """
+    Журнал работы численного метода.
+
+    Метод, которому передан trace, записывает в него приближения,
+    невязки, время каждой итерации (в наносекундах), число вычислений
+    функции и причину остановки. Без trace (по умолчанию) методы
+    работают как обычно и ничего не записывают.
+    """
+
+    def __init__(self, name=''):
+        self.name = name
+        self.iterates = []
+        self.residuals = []
+        self.times_ns = []
+        self.evaluations = 0
+        self.reason = None
+        self.total_ns = 0
+        self._start = self._last = time.perf_counter_ns()
+
+    @property
+    def iterations(self):
+        return len(self.iterates)
+
+    def start(self, name=None):
+        """
+        Начинает отсчёт времени (вызывается методом в начале работы).
+        """
+        if name is not None and not self.name:
+            self.name = name
+        self._start = self._last = time.perf_counter_ns()
+
+    def counted(self, function):
+        """
+        Возвращает функцию, которая учитывает свои вычисления в журнале.
+        Вызов на массиве учитывается как вычисление в каждой его точке.
+        """
+        def wrapper(x):
+            result = function(x)
+            self.evaluations += int(np.size(getattr(x, 'value', x)))
+            return result
+        return wrapper
+
+    def record(self, x, residual=None):
+        """
+        Записывает очередную итерацию: приближение и невязку.
+        """
+        now = time.perf_counter_ns()
+        self.times_ns.append(now - self._last)
+        self._last = now
+        self.iterates.append(x)
+        self.residuals.append(residual)
+
+    def finish(self, reason):
+        """
+        Записывает причину остановки и общее время работы.
+        """
+        self.reason = reason
+        self.total_ns = time.perf_counter_ns() - self._start
+
+    def summary(self):
+        """
+        Возвращает основные показатели в виде словаря.
+        """
+        return {
+            'name': self.name,
+            'iterations': self.iterations,
+            'evaluations': self.evaluations,
+            'reason': self.reason,
+            'total_ns': self.total_ns,
+            'last_residual': self.residuals[-1] if self.residuals else None,
+        }
+
+    def __str__(self):
+        return (f"{self.name or 'метод'}: {self.iterations} итераций, {self.evaluations} вычислений функции, "
+                f"{self.total_ns / 1e6:.3f} мс, остановка: {self.reason}")
+
+
+class _NullTrace:
+    """
+    Пустой журнал: используется, когда trace не передан.
+    """
+
+    def start(self, name=None):
+        pass
+
+    def counted(self, function):
+        return function
+
+    def record(self, x, residual=None):
+        pass
+
+    def finish(self, reason):
+        pass
+
+
+NO_TRACE = _NullTrace()
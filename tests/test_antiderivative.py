@@ -0,0 +1,32 @@
+import math
+
+import numpy as np
+
+from antiderivative import Antiderivative
+
+
+def test_extension_does_not_leave_domain():
+    # запас при расширении не должен заходить левее нуля, где log не определён
+    table = Antiderivative(np.log)
+    table.integral(1.0, 2.0)
+    value = table.integral(0.5, 2.0)
+    assert value == Antiderivative(np.log).integral(0.5, 2.0)
+    assert math.isclose(value, 2 * math.log(2) - 2 - (0.5 * math.log(0.5) - 0.5), rel_tol=1e-10)
+
+
+def test_extension_does_not_cross_pole():
+    # запас за pi/2 не должен измельчать шаг всей таблицы
+    table = Antiderivative(np.tan)
+    table.integral(0.0, 1.0)
+    value = table.integral(0.0, 1.55)
+    fresh = Antiderivative(np.tan)
+    fresh.integral(0.0, 1.55)
+    assert table.converged and table.step == fresh.step
+    assert math.isclose(value, -math.log(math.cos(1.55)), rel_tol=1e-10)
+
+
+def test_array_queries():
+    table = Antiderivative(np.sin)
+    a = np.linspace(-20.0, 5.0, 50)
+    b = np.linspace(30.0, -3.0, 50)
+    assert np.allclose(table.integral(a, b), np.cos(a) - np.cos(b), atol=1e-9)
@@ -0,0 +1,17 @@
+import batch
+
+
+def test_trace_for_every_method():
+    problems = [{'expression': '1/sqrt(abs(x))', 'method': 'singular', 'a': -1, 'b': 1},
+                {'expression': 'exp(x)', 'method': 'antiderivative', 'intervals': [[0, 1], [0, 2]], 'tol': 1e-9},
+                {'expression': 'x^2 - 2', 'method': 'all_roots', 'a': -3, 'b': 3}]
+    for index, problem in enumerate(problems):
+        result = batch.run((index, problem, True))
+        assert 'error' not in result
+        assert result['trace']['name'] == problem['method'].replace('all_roots', 'find_all')
+        assert result['trace']['evaluations'] > 0
+
+
+def test_no_trace_after_error():
+    result = batch.run((0, {'expression': '1/x', 'method': 'singular', 'a': -1, 'b': 1}, True))
+    assert result['error'].startswith('DivergentIntegral') and 'trace' not in result
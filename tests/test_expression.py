@@ -0,0 +1,27 @@
+import time
+
+import numpy as np
+import pytest
+
+from expression import compile_expression, ExpressionError
+
+
+def test_huge_power_fails_fast():
+    f = compile_expression('9**9**9 * x')
+    begin = time.perf_counter()
+    for x in (1.0, np.array([1.0, 2.0])):
+        with pytest.raises(OverflowError):
+            f(x)
+    assert time.perf_counter() - begin < 1.0
+
+
+def test_integer_literals_still_work():
+    f = compile_expression('x^2 + 3*x - 1')
+    assert f(2) == 9.0
+    assert np.allclose(f(np.array([0.0, 1.0])), [-1.0, 3.0])
+    assert f.derivative()(2.0) == 7.0
+
+
+def test_rejects_attribute_access():
+    with pytest.raises(ExpressionError):
+        compile_expression('x.__class__')
@@ -0,0 +1,30 @@
+import math
+
+import numpy as np
+import pytest
+
+import quadrature
+
+
+@pytest.fixture
+def cache_file(tmp_path, monkeypatch):
+    path = tmp_path / 'gauss_legendre.npz'
+    monkeypatch.setattr(quadrature, 'GAUSS_CACHE_FILE', str(path))
+    monkeypatch.setattr(quadrature, '_gauss_table', None)
+    return path
+
+
+def test_corrupt_file_is_a_cache_miss(cache_file):
+    cache_file.write_bytes(b'PK\x03\x04 truncated')
+    value = quadrature.gauss_legendre(np.exp, 0.0, 1.0, 20)
+    assert math.isclose(value, math.e - 1, rel_tol=1e-14)
+    with np.load(cache_file) as data:
+        assert data['20'].shape == (2, 20)
+
+
+def test_mismatched_entry_is_recomputed(cache_file):
+    np.savez(cache_file, **{'20': np.zeros((2, 3))})
+    value = quadrature.gauss_legendre(np.exp, 0.0, 1.0, 20)
+    assert math.isclose(value, math.e - 1, rel_tol=1e-14)
+    with np.load(cache_file) as data:
+        assert np.allclose(data['20'], np.polynomial.legendre.leggauss(20))
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+import parallel
+import quadrature
+
+SERIAL = {
+    'left': lambda f, a, b, n: quadrature.rectangles(f, a, b, n, 0),
+    'right': lambda f, a, b, n: quadrature.rectangles(f, a, b, n, 1),
+    'trapezoid': quadrature.trapezoid,
+    'simpson': quadrature.simpson,
+}
+
+
+def f(x):
+    return np.sin(3 * x) + x ** 2
+
+
+@pytest.mark.parametrize('rule', sorted(SERIAL))
+@pytest.mark.parametrize('num', [7, 1000, quadrature.CHUNK - 1, quadrature.CHUNK, quadrature.CHUNK + 1])
+def test_deterministic_matches_serial(rule, num):
+    expected = SERIAL[rule](f, 0.0, 2.0, num)
+    assert parallel.integrate(f, 0.0, 2.0, num, rule, workers=1, chunk=1000) == expected
+
+
+@pytest.mark.parametrize('chunk', [1, 3, 4096])
+def test_result_does_not_depend_on_workers(chunk):
+    expected = quadrature.simpson(f, -1.0, 2.0, 999)
+    try:
+        for workers in (1, 2):
+            assert parallel.integrate(f, -1.0, 2.0, 999, 'simpson', workers, chunk) == expected
+    finally:
+        parallel.shutdown()
@@ -0,0 +1,16 @@
+import math
+
+import numpy as np
+
+import quadrature
+
+
+def test_romberg_not_fooled_by_aliasing():
+    # на 1, 2 и 4 отрезках все узлы — нули sin(4x)**2
+    value, table, evaluations = quadrature.romberg(lambda x: np.sin(4 * x) ** 2, 0, math.pi)
+    assert math.isclose(value, math.pi / 2, rel_tol=1e-9)
+
+
+def test_romberg_smooth():
+    value, table, evaluations = quadrature.romberg(np.exp, 0.0, 1.0)
+    assert math.isclose(value, math.e - 1, rel_tol=1e-12)
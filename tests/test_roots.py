@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+import roots
+
+
+def test_bisection_batch_stops_at_float_spacing():
+    # precision меньше расстояния между числами около 1e5: раньше цикл не заканчивался
+    r, iterations, converged = roots.bisection_batch(
+        lambda x: x - (1e5 + 0.3), np.array([1e5]), np.array([1e5 + 1]), precision=1e-12)
+    assert converged[0] and abs(r[0] - (1e5 + 0.3)) < 1e-10
+    assert iterations[0] < 64
+
+
+def test_find_all_far_from_zero():
+    found, evaluations = roots.find_all(lambda x: x ** 2 - 100000007, 9000, 11000)
+    assert found.size == 1 and abs(found[0] - np.sqrt(100000007)) < 1e-7
+    # двойной корень уточняется золотым сечением
+    found, _ = roots.find_all(lambda x: (x - 12345.678) ** 2, 9000, 20000)
+    assert found.size == 1 and abs(found[0] - 12345.678) < 1e-4
+
+
+def test_find_all_skips_jumps():
+    step = lambda x: np.abs(x - 0.3) / (x - 0.3)
+    assert roots.find_all(step, -1, 1)[0].size == 0
+    assert roots.find_all(lambda x: step(x) + 0.5, -1, 1)[0].size == 0
+    found, _ = roots.find_all(np.tan, -4, 4)
+    assert np.allclose(found, [-np.pi, 0.0, np.pi], atol=1e-11)
+
+
+def test_newton_derivative_methods():
+    f = lambda x: np.exp(x) - 3
+    for method in ('dual', 'complex'):
+        assert abs(roots.newton(f, None, 1.0, 1e-12, 50, method=method) - np.log(3)) < 1e-12
+        r, _, converged = roots.newton_batch(f, None, np.array([0.0, 1.0, 2.0]), 1e-12, 50, method=method)
+        assert converged.all() and np.allclose(r, np.log(3), rtol=0, atol=1e-12)
+    with pytest.raises(ValueError):
+        roots.newton(f, None, 1.0, method='finite')
+
+
+def test_brent_meets_precision_at_multiple_root():
+    # у тройного корня интерполяция сходится медленно: раньше через max_iter
+    # итераций возвращалось 1.00000000024562
+    root, _, _ = roots.brent(lambda x: (x - 1) ** 3, 0.0, 3.0, 1e-12)
+    assert abs(root - 1) <= 1e-12
+    root, _, _ = roots.brent(lambda x: (x - 1) ** 3, 0.0, 3.0, 1e-12, max_iter=5)
+    assert abs(root - 1) <= 1e-12
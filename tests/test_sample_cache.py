@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+import quadrature
+import singular
+from sample_cache import SampleCache
+
+
+def test_cached_arrays_cannot_be_corrupted():
+    cached = SampleCache().wrap(np.sin)
+    x = np.linspace(0.0, 1.0, 5)
+    y = quadrature.evaluate(cached, x)
+    with pytest.raises(ValueError):
+        y[0] = 123.0
+    assert quadrature.evaluate(cached, x)[0] == 0.0
+    assert x.flags.writeable
+
+
+def test_singular_works_with_cache():
+    cached = SampleCache().wrap(np.tan)
+    points, _ = singular.find_singularities(cached, 0.0, 2.0)
+    assert [kind for _, kind in points] == ['pole']
+    # повторный поиск берёт значения из кэша и находит то же
+    assert singular.find_singularities(cached, 0.0, 2.0)[0] == points
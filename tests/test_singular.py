@@ -0,0 +1,32 @@
+import math
+import warnings
+
+import numpy as np
+
+import singular
+
+
+def test_removable_point_is_not_a_pole():
+    sinc = lambda x: np.sin(x) / x
+    with np.errstate(all='ignore'):
+        points, _ = singular.find_singularities(sinc, -1.0, 1.0)
+        assert points == [(0.0, 'removable')]
+        value, error, _, _ = singular.integrate(sinc, -1.0, 1.0)
+    # 2·Si(1)
+    assert abs(value - 1.8921661407343662) < 1e-12
+
+
+def test_kinds_of_singularities():
+    cases = [(lambda x: 1 / x, 'pole'), (lambda x: np.log(np.abs(x)), 'pole'),
+             (lambda x: 1 / np.sqrt(np.abs(x)), 'pole'), (lambda x: np.abs(x) / x, 'jump')]
+    with np.errstate(all='ignore'):
+        for f, kind in cases:
+            assert singular.find_singularities(f, -1.0, 1.0)[0] == [(0.0, kind)]
+
+
+def test_locate_huge_values_without_warnings():
+    # у полюса нечётного порядка произведение f(a)·f(mid) переполнялось
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        points, _ = singular.find_singularities(lambda x: 1 / (x - 0.3) ** 11, -1.0, 1.0)
+    assert len(points) == 1 and points[0][1] == 'pole' and math.isclose(points[0][0], 0.3)
@@ -0,0 +1,131 @@
+import math
+
+from scheduler import RedrawScheduler
+
+# Наибольшее расстояние между соседними точками графика на экране (пиксели).
+# Пока точки расположены чаще, при масштабировании график не пересчитывается.
+MAX_SAMPLE_SPACING = 4.0
+
+
+class ZoomPan:
+    """
+    Масштабирование колесом мыши и перетаскивание графика мышью.
+
+    Во время движения меняются только уже нарисованные элементы холста
+    (canvas.scale / canvas.move — один вызов Tk на кадр), функция при
+    этом не вычисляется. Когда пользователь останавливается (через delay мс),
+    вызывается on_change(view): по текущим scale, center_x, center_y
+    программа обновляет то, что нужно, — например, пересчитывает график,
+    только если covers() сообщает, что точек на экране стало мало.
+
+    canvas — холст (или scene.Scene),
+    scale — пикселей на единицу, center_x, center_y — положение начала координат,
+    min_scale, max_scale — пределы масштаба.
+    """
+
+    def __init__(self, canvas, scale, center_x, center_y, on_change,
+                 min_scale=10.0, max_scale=10000.0, delay=150):
+        self.canvas = canvas
+        self.scale = float(scale)
+        self.center_x = float(center_x)
+        self.center_y = float(center_y)
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.on_change = on_change
+        self._settle = RedrawScheduler(canvas, lambda: self.on_change(self), delay)
+        self._drag = None
+
+        canvas.bind('<MouseWheel>', self._on_wheel)                        # Windows, macOS
+        canvas.bind('<Button-4>', lambda event: self._on_wheel(event, 1))    # X11
+        canvas.bind('<Button-5>', lambda event: self._on_wheel(event, -1))
+        canvas.bind('<ButtonPress-1>', self._on_press)
+        canvas.bind('<B1-Motion>', self._on_drag)
+
+    def zoom(self, factor, x=None, y=None):
+        """
+        Масштабирует изображение в factor раз относительно точки
+        холста (x, y) (по умолчанию — начала координат).
+        """
+        x = self.center_x if x is None else x
+        y = self.center_y if y is None else y
+        factor = min(max(self.scale * factor, self.min_scale), self.max_scale) / self.scale
+        if factor == 1.0:
+            return
+        self.canvas.scale('all', x, y, factor, factor)
+        self.scale *= factor
+        self.center_x = x + (self.center_x - x) * factor
+        self.center_y = y + (self.center_y - y) * factor
+        self._settle.request()
+
+    def zoom_to(self, scale):
+        """
+        Устанавливает масштаб scale (например, с ползунка).
+        """
+        self.zoom(scale / self.scale)
+
+    def pan(self, dx, dy):
+        """
+        Сдвигает изображение на (dx, dy) пикселей.
+        """
+        self.canvas.move('all', dx, dy)
+        self.center_x += dx
+        self.center_y += dy
+        self._settle.request()
+
+    def visible(self):
+        """
+        Возвращает отрезок оси x, видимый на холсте.
+        """
+        width = float(self.canvas['width'])
+        return -self.center_x / self.scale, (width - self.center_x) / self.scale
+
+    def visible_y(self):
+        """
+        Возвращает отрезок оси y, видимый на холсте (снизу вверх).
+        """
+        height = float(self.canvas['height'])
+        return (self.center_y - height) / self.scale, self.center_y / self.scale
+
+    def covers(self, sampled, max_spacing=MAX_SAMPLE_SPACING):
+        """
+        Достаточно ли графика, построенного для sampled = (начало, конец,
+        шаг, нижняя и верхняя граница по y), при текущем виде: видимая
+        часть плоскости лежит внутри построенной, и шаг точности на экране
+        не больше max_spacing пикселей.
+        """
+        if sampled is None:
+            return False
+        start, finish, step, low, high = sampled
+        left, right = self.visible()
+        bottom, top = self.visible_y()
+        return (start <= left and right <= finish and low <= bottom and top <= high
+                and step * self.scale <= max_spacing)
+
+    def sample_range(self, margin=0.5, spacing=1.0):
+        """
+        Область и шаг для нового построения графика: видимая часть
+        плоскости с запасом margin (доля размера) с каждой стороны, чтобы
+        небольшое перетаскивание не требовало пересчёта, и шаг spacing
+        пикселей. Возвращает (начало, конец, шаг, нижняя граница, верхняя граница).
+        """
+        left, right = self.visible()
+        bottom, top = self.visible_y()
+        extra = (right - left) * margin
+        step = spacing / self.scale
+        start = math.floor((left - extra) / step) * step
+        finish = math.ceil((right + extra) / step) * step
+        extra = (top - bottom) * margin
+        return start, finish, step, bottom - extra, top + extra
+
+    def _on_wheel(self, event, direction=None):
+        if direction is None:
+            direction = 1 if event.delta > 0 else -1
+        self.zoom(1.1 ** direction, event.x, event.y)
+
+    def _on_press(self, event):
+        self._drag = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self._drag is not None:
+            self.pan(event.x - self._drag[0], event.y - self._drag[1])
+            self._drag = (event.x, event.y)
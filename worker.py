@@ -0,0 +1,120 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Cancelled(Exception):
+    """
+    Вычисление было отменено.
+    """
+
+
+class Job:
+    """
+    Состояние одной фоновой задачи: доля выполненной работы и флаг отмены.
+    """
+
+    def __init__(self):
+        self.progress = 0.0
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def report(self, progress):
+        """
+        Сохраняет прогресс (от 0 до 1). Если задача отменена,
+        выбрасывает Cancelled, и вычисление прерывается.
+        """
+        if self.cancelled:
+            raise Cancelled()
+        self.progress = progress
+
+
+class Worker:
+    """
+    Выполняет вычисления в фоновом потоке, чтобы окно не зависало.
+
+    Результат и прогресс передаются в интерфейс из главного потока Tk:
+    виджет периодически (каждые poll мс) проверяет состояние задачи
+    через after. Новая задача отменяет предыдущую.
+    """
+
+    def __init__(self, widget, poll=50):
+        self.widget = widget
+        self.poll = poll
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._job = None
+        self._future = None
+
+    def submit(self, task, on_result, on_progress=None, on_error=None):
+        """
+        Запускает task(job) в фоне.
+
+        on_result(result) — вызывается с результатом,
+        on_progress(progress) — вызывается, пока задача выполняется,
+        on_error(exception) — вызывается, если задача завершилась ошибкой.
+        """
+        self.cancel()
+        job = Job()
+        future = self._executor.submit(task, job)
+        self._job, self._future = job, future
+        self.widget.after(self.poll, self._check, job, future, on_result, on_progress, on_error)
+        return job
+
+    def cancel(self):
+        """
+        Отменяет текущую задачу.
+        """
+        if self._job is not None:
+            self._job.cancel()
+            self._future.cancel()
+            self._job = self._future = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _check(self, job, future, on_result, on_progress, on_error):
+        if job.cancelled:
+            return
+        if not future.done():
+            if on_progress is not None:
+                on_progress(job.progress)
+            self.widget.after(self.poll, self._check, job, future, on_result, on_progress, on_error)
+            return
+
+        self._job = self._future = None
+        try:
+            result = future.result()
+        except Cancelled:
+            return
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+            return
+        on_result(result)
+
+
+def integrate(job, rule, function, start, finish, num, chunk=10**6, align=1):
+    """
+    Вычисляет интеграл составным правилом по частям, сообщая прогресс
+    и проверяя отмену после каждой части.
+
+    job — задача (Job),
+    rule — правило rule(function, start, finish, num),
+    chunk — число отрезков в одной части,
+    align — части кратны align отрезкам (2 для метода Симпсона).
+    """
+    chunk = max(align, chunk - chunk % align)
+    h = (finish - start) / num
+    total = 0.0
+    for lo in range(0, num, chunk):
+        hi = min(lo + chunk, num)
+        total += rule(function, start + lo * h, start + hi * h, hi - lo)
+        job.report(hi / num)
+    return total